@@ -0,0 +1,221 @@
+#-------------------------------------------------------------------------------
+#  Benchmarks for the expansions, units and number theory kernels.
+#
+#  Copyright 2026 Jesse I. Deutsch
+#
+#   $Id:$
+#
+#  Usage --
+#	python3 benchmark.py [-o out.json] [-r repeat] [-k substring]
+#	python3 benchmark.py --compare old.json new.json [-t threshold]
+#
+#  The first form runs the suite and writes the timings as JSON.
+#  The second compares two such files and exits with status 1
+#  if a benchmark got slower by more than the threshold fraction.
+#-------------------------------------------------------------------------------
+
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import factorize
+import nt_backend
+from cntd_frac import cntd_frac, cf_finite, cflist_to_surd
+from surd import Surd, fund_unit, isqrt
+from elem_nt import phi, phi2, sigma, solve_quad_mod
+
+
+SEED = 20260101
+REPEAT = 5
+THRESHOLD = 0.10
+
+										# radicands with long periods
+										# just above 10**6
+RADICANDS = [d for d in range (10**6 + 1, 10**6 + 401) \
+					if isqrt (d)**2 != d]
+
+
+
+def _isqrt_args (digits):
+		rnd = random.Random (SEED + digits)
+		return [rnd.randrange (10**(digits - 1), 10**digits) for i in range (20)]
+
+
+####----- end function -----
+
+
+def _nt_args ():
+		rnd = random.Random (SEED)
+		return [rnd.randrange (10**11, 10**12) for i in range (200)]
+
+
+####----- end function -----
+
+
+def _long_cflist ():
+		rnd = random.Random (SEED)
+		return [rnd.randint (1, 1000) for i in range (100000)]
+
+
+####----- end function -----
+
+
+def _solve_args ():
+		rnd = random.Random (SEED)
+		return [[rnd.randrange (1, 1000), rnd.randrange (1000), \
+					rnd.randrange (1000), rnd.randrange (10**9, 10**10)] \
+					for i in range (50)]
+
+
+####----- end function -----
+
+
+										# name: [setup, run]; setup
+										# makes the input, run (input)
+										# is what gets timed
+BENCHMARKS = {
+	'cntd_frac_radicands': [lambda: RADICANDS, \
+		lambda ds: [cntd_frac (Surd (0, 1, 1, d)) for d in ds]],
+	'cntd_frac_surd': [lambda: Surd (1, 2, 5, 1000099), cntd_frac],
+	'cf_finite_20000': [lambda: Surd (3, 1, 7, 1000099), \
+		lambda x: cf_finite (x, 20000)],
+	'cflist_to_surd': [lambda: cntd_frac (Surd (0, 1, 1, 1000099)), \
+		cflist_to_surd],
+	'cflist_to_rtnl_100000': [_long_cflist, cflist_to_surd],
+	'fund_unit': [lambda: [94, 109, 1000099, 999979], \
+		lambda ms: [fund_unit (m) for m in ms]],
+	'isqrt_50': [lambda: _isqrt_args (50), \
+		lambda xs: [isqrt (x) for x in xs]],
+	'isqrt_500': [lambda: _isqrt_args (500), \
+		lambda xs: [isqrt (x) for x in xs]],
+	'isqrt_5000': [lambda: _isqrt_args (5000), \
+		lambda xs: [isqrt (x) for x in xs]],
+	'phi': [_nt_args, lambda ns: [phi (n) for n in ns]],
+	'phi2': [_nt_args, lambda ns: [phi2 (n) for n in ns]],
+	'sigma': [_nt_args, lambda ns: [sigma (n) for n in ns]],
+	'solve_quad_mod': [_solve_args, \
+		lambda args: [solve_quad_mod (*a) for a in args]],
+}
+
+
+
+def time_one (name, repeat):
+		""" Best and median seconds of repeat runs of one benchmark.
+
+		One untimed run comes first.  The factorization cache is
+		cleared before each run, so the number theory kernels are
+		timed from cold.
+		"""
+
+		setup, run = BENCHMARKS[name]
+		arg = setup ()
+		run (arg)
+		times = []
+		for i in range (repeat):
+			factorize.factor_cache_clear ()
+			gc.collect ()
+			gc.disable ()
+			try:
+				start = time.perf_counter ()
+				run (arg)
+				times.append (time.perf_counter () - start)
+			finally:
+				gc.enable ()
+		return {'min': min (times), 'median': statistics.median (times), \
+				'repeat': repeat}
+
+
+####----- end function -----
+
+
+def run_suite (repeat=REPEAT, select=None):
+		""" Run the benchmarks whose names contain select, all if None.
+
+		Returns a dict ready for json, with the platform and
+		backend under 'env' and the timings under 'results'.
+		"""
+
+		results = {}
+		for name in BENCHMARKS:
+			if select is None or select in name:
+				results[name] = time_one (name, repeat)
+		env = {'python': platform.python_version (), \
+				'implementation': platform.python_implementation (), \
+				'machine': platform.machine (), \
+				'backend': nt_backend.get_backend ().name}
+		return {'env': env, 'results': results}
+
+
+####----- end function -----
+
+
+def compare (old, new, threshold=THRESHOLD):
+		""" Compare two run_suite results on the min times.
+
+		Returns [rows, regressions], rows being [name, old, new,
+		ratio] for the benchmarks in both, and regressions the
+		names with ratio above 1 + threshold.
+		"""
+
+		rows = []
+		regressions = []
+		for name in old['results']:
+			if name not in new['results']:
+				continue
+			t_old = old['results'][name]['min']
+			t_new = new['results'][name]['min']
+			ratio = t_new / t_old if t_old > 0 else float ('inf')
+			rows.append ([name, t_old, t_new, ratio])
+			if ratio > 1 + threshold:
+				regressions.append (name)
+		return [rows, regressions]
+
+
+####----- end function -----
+
+
+def main (argv=None):
+		parser = argparse.ArgumentParser (description="Continued fraction " \
+					"benchmarks.")
+		parser.add_argument ('-o', '--output', help="write JSON here, " \
+					"default standard output")
+		parser.add_argument ('-r', '--repeat', type=int, default=REPEAT)
+		parser.add_argument ('-k', '--select', help="run only names " \
+					"containing this")
+		parser.add_argument ('--compare', nargs=2, metavar=('OLD', 'NEW'))
+		parser.add_argument ('-t', '--threshold', type=float, \
+					default=THRESHOLD)
+		args = parser.parse_args (argv)
+
+		if args.compare:
+			with open (args.compare[0]) as f:
+				old = json.load (f)
+			with open (args.compare[1]) as f:
+				new = json.load (f)
+			rows, regressions = compare (old, new, args.threshold)
+			for name, t_old, t_new, ratio in rows:
+				flag = '  SLOWER' if name in regressions else ''
+				print ("%-24s %10.4f %10.4f %7.2fx%s" \
+						% (name, t_old, t_new, ratio, flag))
+			return 1 if regressions else 0
+
+		text = json.dumps (run_suite (args.repeat, args.select), indent=2)
+		if args.output:
+			with open (args.output, 'w') as f:
+				f.write (text + '\n')
+		else:
+			print (text)
+		return 0
+
+
+####----- end function -----
+
+
+if __name__ == '__main__':
+	sys.exit (main ())
@@ -0,0 +1,35 @@
+#-----------------------------------------------------------
+# benchmark_test -- unit tests for the benchmark driver.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-----------------------------------------------------------
+
+
+import unittest
+from benchmark import *
+
+
+class Benchmark_Tests (unittest.TestCase):
+
+	def testRunSuite (self):
+		ans = run_suite (repeat=2, select='phi2')
+		self.failUnless (list (ans['results']) == ['phi2'])
+		self.failUnless (ans['results']['phi2']['repeat'] == 2)
+		self.failUnless (ans['env']['backend'] in nt_backend.BACKENDS)
+		json.dumps (ans)
+
+	def testCompare (self):
+		old = {'results': {'a': {'min': 1.0}, 'b': {'min': 1.0}, \
+							'c': {'min': 1.0}}}
+		new = {'results': {'a': {'min': 1.05}, 'b': {'min': 1.5}}}
+		rows, regressions = compare (old, new, 0.10)
+		self.failUnless ([r[0] for r in rows] == ['a', 'b'])
+		self.failUnless (regressions == ['b'])
+
+
+def main():
+	unittest.main()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,103 @@
+#-------------------------------------------------------------------------------
+#  Module for asyncio versions of the long running expansions.
+#
+#  Copyright 2026 Jesse I. Deutsch
+#
+#   $Id:$
+#-------------------------------------------------------------------------------
+
+
+import asyncio
+
+from cntd_frac import cntd_frac, cntd_frac_steps
+from surd import fund_unit, fund_unit_steps
+
+
+										# steps between returns to the loop
+CHUNK = 1000
+
+
+
+async def run_steps (steps, timeout=None):
+		""" Drive a step generator from a coroutine.
+
+		The generator (e.g. from cntd_frac_steps) is advanced until
+		it yields, then control goes back to the event loop.  If
+		timeout seconds pass first, the generator is closed and
+		asyncio.TimeoutError is raised.  Cancelling the task stops
+		it at the next yield.
+		"""
+
+		loop = asyncio.get_running_loop ()
+		deadline = None
+		if timeout is not None:
+			deadline = loop.time () + timeout
+		try:
+			while (1):
+				try:
+					next (steps)
+				except StopIteration as done:
+					return done.value
+				if deadline is not None and loop.time () >= deadline:
+					raise asyncio.TimeoutError
+										# let other tasks run, and
+										# take any cancellation here
+				await asyncio.sleep (0)
+		finally:
+			steps.close ()
+
+
+####----- end function -----
+
+
+async def _run_offloaded (func, arg, timeout, executor):
+		""" Run func (arg) in an executor, waiting at most timeout.
+
+		On timeout or cancellation the awaiting task is released at
+		once.  A thread already running func cannot be stopped and
+		finishes in the background; use a process pool when that
+		matters.
+		"""
+
+		loop = asyncio.get_running_loop ()
+		future = loop.run_in_executor (executor, func, arg)
+		return await asyncio.wait_for (future, timeout)
+
+
+####----- end function -----
+
+
+async def cntd_frac_async (x, timeout=None, chunk=CHUNK, offload=False, \
+							executor=None):
+		""" Continued fraction expansion of a Surd, for asyncio.
+
+		Same result as cntd_frac (x).  By default the expansion
+		runs in the event loop and gives it back every chunk
+		partial quotients.  With offload set it runs in executor
+		(None is the loop's default executor) instead.  Raises
+		asyncio.TimeoutError after timeout seconds.
+		"""
+
+		if offload:
+			return await _run_offloaded (cntd_frac, x, timeout, executor)
+		return await run_steps (cntd_frac_steps (x, chunk), timeout)
+
+
+####----- end function -----
+
+
+async def fund_unit_async (m, timeout=None, chunk=CHUNK, offload=False, \
+							executor=None):
+		""" Fundamental unit of Q(sqrt(m)), for asyncio.
+
+		Same result as fund_unit (m).  Arguments as for
+		cntd_frac_async; chunk counts partial quotients of the
+		period of w, as in fund_unit_steps.
+		"""
+
+		if offload:
+			return await _run_offloaded (fund_unit, m, timeout, executor)
+		return await run_steps (fund_unit_steps (m, chunk), timeout)
+
+
+####----- end function -----
@@ -0,0 +1,56 @@
+#-----------------------------------------------------------
+# cf_async_test -- unit tests for the asyncio expansions.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-----------------------------------------------------------
+
+
+import asyncio
+import unittest
+from cf_async import *
+from cntd_frac import Surd
+
+
+class Cf_Async_Tests (unittest.TestCase):
+
+	def testCntdFracAsync (self):
+		rt97 = Surd (0, 1, 1, 97)
+		ans = asyncio.run (cntd_frac_async (rt97, chunk=2))
+		self.failUnless (ans == [9,[1,5,1,1,1,1,1,1,5,1,18]])
+		a = Surd (81, 0, 43, 2)
+		ans = asyncio.run (cntd_frac_async (a, chunk=1))
+		self.failUnless (ans == [1,1,7,1,1,2])
+		ans = asyncio.run (cntd_frac_async (rt97, offload=True))
+		self.failUnless (ans == [9,[1,5,1,1,1,1,1,1,5,1,18]])
+
+	def testFundUnitAsync (self):
+		ans = asyncio.run (fund_unit_async (94, chunk=100))
+		self.failUnless (str(ans) == str(Surd (2143295, 221064, 1, 94)))
+		ans = asyncio.run (fund_unit_async (5))
+		self.failUnless (str(ans) == str(Surd (1, 1, 2, 5)))
+
+	def testTimeout (self):
+		big = Surd (0, 1, 1, 1000099)
+		coro = cntd_frac_async (big, timeout=0, chunk=1)
+		self.assertRaises (asyncio.TimeoutError, asyncio.run, coro)
+
+	def testCancel (self):
+		async def cancel_it ():
+			big = Surd (0, 1, 1, 1000099)
+			task = asyncio.ensure_future (cntd_frac_async (big, chunk=1))
+			await asyncio.sleep (0)
+			task.cancel ()
+			try:
+				await task
+			except asyncio.CancelledError:
+				return True
+			return False
+		self.failUnless (asyncio.run (cancel_it ()))
+
+
+def main():
+	unittest.main()
+
+
+if __name__ == '__main__':
+	main()
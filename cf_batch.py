@@ -0,0 +1,118 @@
+#-------------------------------------------------------------------------------
+#  Module for batch continued fraction expansion of rationals.
+#
+#  Copyright 2026 Jesse I. Deutsch
+#
+#   $Id:$
+#-------------------------------------------------------------------------------
+
+
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+
+INT64_MAX = 2**63 - 1
+
+
+
+def _as_int_array (vals):
+		""" Integer NumPy array for vals, int64 when it fits.
+
+		Values of magnitude over 2**63 - 1 (so also -2**63, which
+		cannot be negated) keep dtype object, i.e. Python ints.
+		"""
+
+		arr = np.asarray (vals)
+		if arr.size == 0:
+			return arr.astype (np.int64)
+		if arr.dtype.kind not in 'iuO':
+			raise TypeError ("numerators and denominators must be integers")
+		if arr.dtype.kind == 'O':
+			big = max (abs (int (v)) for v in arr)
+		else:
+			big = max (abs (int (arr.max ())), abs (int (arr.min ())))
+		if big <= INT64_MAX:
+			return arr.astype (np.int64)
+		return np.array ([int (v) for v in arr], dtype=object)
+
+
+####----- end function -----
+
+
+def cf_batch (nums, dens):
+		""" Continued fractions of the rationals nums[i] / dens[i].
+
+		Arguments are 1-d arrays (or sequences) of integers.  One
+		Euclidean step is applied to every unfinished fraction at
+		once.  int64 is used when all inputs fit, as remainders
+		and quotients never exceed the inputs in size; otherwise
+		the arrays hold Python ints.  Returns [values, offsets]
+		with the expansion of fraction i in
+						values[offsets[i] : offsets[i+1]] ,
+		each matching cntd_frac (Surd (nums[i], 0, dens[i], r)).
+		"""
+
+		if np is None:
+			raise ImportError ("cf_batch requires numpy")
+		p = _as_int_array (nums)
+		q = _as_int_array (dens)
+		if p.ndim != 1 or p.shape != q.shape:
+			raise ValueError ("nums and dens must be 1-d and equal length")
+		if (q == 0).any ():
+			raise ZeroDivisionError
+										# common dtype, object if
+										# either one needs it
+		if p.dtype != q.dtype:
+			p, q = p.astype (object), q.astype (object)
+		n = p.shape[0]
+										# make denominators positive
+		neg = q < 0
+		p = np.where (neg, -p, p)
+		q = np.where (neg, -q, q)
+
+		counts = np.zeros (n, dtype=np.int64)
+		rows = np.arange (n)
+		step_rows = []
+		step_vals = []
+		while rows.size:
+										# __floordiv__ is `//'
+			cf_floor = p // q
+			step_rows.append (rows)
+			step_vals.append (cf_floor)
+			counts[rows] += 1
+			rem = p - cf_floor * q
+										# zero means end of contd frac
+			live = rem != 0
+			rows = rows[live]
+			p, q = q[live], rem[live]
+
+		offsets = np.zeros (n + 1, dtype=np.int64)
+		np.cumsum (counts, out=offsets[1:])
+		if not step_rows:
+			return [np.zeros (0, dtype=p.dtype), offsets]
+										# steps are in order, so a
+										# stable sort on the row groups
+										# each expansion in order
+		all_rows = np.concatenate (step_rows)
+		all_vals = np.concatenate (step_vals)
+		order = np.argsort (all_rows, kind='stable')
+		return [all_vals[order], offsets]
+
+
+####----- end function -----
+
+
+def cf_batch_lists (nums, dens):
+		""" As cf_batch, but returns a list of Python lists.
+
+		For small batches and for checking results.
+		"""
+
+		values, offsets = cf_batch (nums, dens)
+		return [[int (v) for v in values[offsets[i]:offsets[i + 1]]] \
+					for i in range (len (offsets) - 1)]
+
+
+####----- end function -----
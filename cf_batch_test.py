@@ -0,0 +1,46 @@
+#-----------------------------------------------------------
+# cf_batch_test -- unit tests for batch rational expansion.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-----------------------------------------------------------
+
+
+import unittest
+from cf_batch import *
+from cntd_frac import cntd_frac, Surd
+
+
+@unittest.skipIf (np is None, "numpy not installed")
+class Cf_Batch_Tests (unittest.TestCase):
+
+	def testCfBatch (self):
+		values, offsets = cf_batch ([81, 97, 5, 0], [43, 22, -3, 9])
+		self.failUnless (values.dtype == np.int64)
+		self.failUnless (list(offsets) == [0, 6, 10, 12, 13])
+		self.failUnless (list(values[0:6]) == [1,1,7,1,1,2])
+		self.failUnless (list(values[6:10]) == [4,2,2,4])
+		self.failUnless (list(values[10:12]) == [-2,3])
+		self.failUnless (list(values[12:13]) == [0])
+
+	def testCfBatchBigints (self):
+		nums = [10**40 + 7, -2**63, 355]
+		dens = [3**30, 7, 113]
+		values, offsets = cf_batch (nums, dens)
+		self.failUnless (values.dtype == object)
+		ans = cf_batch_lists (nums, dens)
+		for i in range (3):
+			cf = cntd_frac (Surd (nums[i], 0, dens[i], 2))
+			self.failUnless (ans[i] == cf)
+
+	def testCfBatchErrors (self):
+		self.assertRaises (ZeroDivisionError, cf_batch, [1, 2], [1, 0])
+		self.assertRaises (ValueError, cf_batch, [1, 2], [1])
+		self.assertRaises (TypeError, cf_batch, [1.5], [2])
+
+
+def main():
+	unittest.main()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,211 @@
+#-------------------------------------------------------------------------------
+#  Module for an opt-in LRU cache of expansions and units.
+#
+#  Copyright 2026 Jesse I. Deutsch
+#
+#   $Id:$
+#-------------------------------------------------------------------------------
+
+
+from collections import OrderedDict, namedtuple
+
+import surd
+import cntd_frac
+
+
+CACHE_SIZE = 1024
+
+CacheInfo = namedtuple ('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+
+class LRUCache:
+		""" Mapping of bounded size, dropping the least recently used.
+
+		maxsize None means unbounded, 0 stores nothing.  Counts
+		hits and misses of get.
+		"""
+
+		def __init__ (self, maxsize=CACHE_SIZE):
+			self.maxsize = maxsize
+			self.data = OrderedDict ()
+			self.hits = 0
+			self.misses = 0
+
+		def get (self, key):
+			""" The value for key, or None, marking it recently used. """
+			try:
+				value = self.data[key]
+			except KeyError:
+				self.misses = self.misses + 1
+				return None
+			self.data.move_to_end (key)
+			self.hits = self.hits + 1
+			return value
+
+		def put (self, key, value):
+			if self.maxsize == 0:
+				return
+			self.data[key] = value
+			self.data.move_to_end (key)
+			if self.maxsize is not None and len (self.data) > self.maxsize:
+				self.data.popitem (last=False)
+
+		def info (self):
+			return CacheInfo (self.hits, self.misses, self.maxsize, \
+								len (self.data))
+
+		def clear (self):
+			self.data.clear ()
+			self.hits = 0
+			self.misses = 0
+
+
+#----- end of class -------
+
+
+
+def shift_key (x):
+		""" [key, j, y] with x = y + j, j an integer.
+
+		y is the representative of x modulo the integers: for an
+		irrational x = (P + sqrt(D))/Q in pq_form, P is reduced mod
+		Q, and for a rational a/d, a is reduced mod d.  key is the
+		tuple of y's state, the same for all integer shifts of x.
+		"""
+
+		surd.Surd.settle (x)
+		if x.b == 0:
+			j, a = divmod (x.a, x.d)
+			return [(a, x.d), j, surd.Surd (a, 0, x.d, x.r)]
+		P, Q, D = x.pq_form ()
+		j, P0 = divmod (P, Q)
+		return [(P0, Q, D), j, surd.Surd (P0, 1, Q, D)]
+
+
+####----- end function -----
+
+
+def shift_cflist (cflist, j):
+		""" Expansion of y + j from the expansion cflist of y.
+
+		A copy, with j added to the leading term.  If y is purely
+		periodic, [[c_1, ..., c_L]], the leading term c_1 + j no
+		longer repeats, so the result is [c_1 + j, [c_2, ..., c_L, c_1]].
+		The other way, [c_0, [c_1, ..., c_L]] becomes purely periodic,
+		[[c_L, c_1, ..., c_(L-1)]], when c_0 + j = c_L.
+		"""
+
+		if len (cflist) == 0:
+			return []
+		if isinstance (cflist[-1], list):
+			period = list (cflist[-1])
+			if j == 0:
+				return cflist[:-1] + [period]
+			if len (cflist) == 1:
+				return [period[0] + j, period[1:] + period[:1]]
+			if len (cflist) == 2 and cflist[0] + j == period[-1]:
+				return [period[-1:] + period[:-1]]
+			return [cflist[0] + j] + cflist[1:-1] + [period]
+		return [cflist[0] + j] + cflist[1:]
+
+
+####----- end function -----
+
+
+
+class CfCache:
+		""" LRU caches for cntd_frac, cf_finite and fund_unit.
+
+		Expansions are keyed on the state of the Surd reduced
+		modulo the integers (see shift_key), so a Surd and its
+		integer shifts share one entry.  Results are copied on the
+		way out, so callers may change them.
+		"""
+
+		def __init__ (self, maxsize=CACHE_SIZE):
+			self.caches = {'cntd_frac': LRUCache (maxsize), \
+							'cf_finite': LRUCache (maxsize), \
+							'fund_unit': LRUCache (maxsize)}
+
+		def cntd_frac (self, x, compute):
+			""" cntd_frac (x), with compute (y) the uncached version. """
+			key, j, y = shift_key (x)
+			cache = self.caches['cntd_frac']
+			cflist = cache.get (key)
+			if cflist is None:
+				cflist = compute (y)
+				cache.put (key, cflist)
+			return shift_cflist (cflist, j)
+
+		def cf_finite (self, x, bnd, compute):
+			""" cf_finite (x, bnd), with compute (y) the uncached version. """
+			key, j, y = shift_key (x)
+			cache = self.caches['cf_finite']
+			cflist = cache.get ((key, bnd))
+			if cflist is None:
+				cflist = compute (y)
+				cache.put ((key, bnd), cflist)
+			return shift_cflist (cflist, j)
+
+		def fund_unit (self, m, compute):
+			cache = self.caches['fund_unit']
+			unit = cache.get (m)
+			if unit is None:
+				unit = compute (m)
+				cache.put (m, unit)
+										# error messages are strings
+			if isinstance (unit, str):
+				return unit
+			return surd.Surd (unit.a, unit.b, unit.d, unit.r)
+
+		def info (self):
+			return {name: c.info () for name, c in self.caches.items ()}
+
+		def clear (self):
+			for c in self.caches.values ():
+				c.clear ()
+
+
+#----- end of class -------
+
+
+
+def enable (maxsize=CACHE_SIZE):
+		""" Start caching cntd_frac, cf_finite and fund_unit.
+
+		Each keeps at most maxsize results (None for no limit).
+		Any earlier cache is dropped.  Returns the CfCache.
+		"""
+
+		cntd_frac.result_cache = surd.result_cache = CfCache (maxsize)
+		return cntd_frac.result_cache
+
+
+####----- end function -----
+
+
+def disable ():
+		cntd_frac.result_cache = surd.result_cache = None
+
+
+####----- end function -----
+
+
+def cache_info ():
+		""" Hits, misses and sizes by function, or None if disabled. """
+
+		if cntd_frac.result_cache is None:
+			return None
+		return cntd_frac.result_cache.info ()
+
+
+####----- end function -----
+
+
+def cache_clear ():
+		if cntd_frac.result_cache is not None:
+			cntd_frac.result_cache.clear ()
+
+
+####----- end function -----
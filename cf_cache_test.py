@@ -0,0 +1,72 @@
+#-----------------------------------------------------------
+# cf_cache_test -- unit tests for the expansion cache.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-----------------------------------------------------------
+
+
+import unittest
+import cf_cache
+from cntd_frac import *
+
+
+class Cf_Cache_Tests (unittest.TestCase):
+
+	def setUp (self):
+		cf_cache.enable (maxsize=4)
+
+	def tearDown (self):
+		cf_cache.disable ()
+
+	def testLRU (self):
+		c = cf_cache.LRUCache (2)
+		c.put (1, 'a')
+		c.put (2, 'b')
+		self.failUnless (c.get (1) == 'a')
+		c.put (3, 'c')
+		self.failUnless (c.get (2) is None)
+		self.failUnless (c.info () == (1, 1, 2, 2))
+		c.clear ()
+		self.failUnless (c.info () == (0, 0, 2, 0))
+
+	def testShift (self):
+		rt97 = Surd (0, 1, 1, 97)
+		self.failUnless (cntd_frac (rt97) == [9,[1,5,1,1,1,1,1,1,5,1,18]])
+										# the reduced 9 + sqrt(97) and
+										# shifts of it hit the cache
+		ans = cntd_frac (Surd (9, 1, 1, 97))
+		self.failUnless (ans == [[18,1,5,1,1,1,1,1,1,5,1]])
+		ans = cntd_frac (Surd (-3, 1, 1, 97))
+		self.failUnless (ans == [6,[1,5,1,1,1,1,1,1,5,1,18]])
+		ans = cntd_frac (Surd (1, 1, 2, 5))
+		self.failUnless (ans == [[1]])
+		ans = cntd_frac (Surd (3, 1, 2, 5))
+		self.failUnless (ans == [2,[1]])
+		ans = cntd_frac (Surd (81 + 43, 0, 43, 2))
+		self.failUnless (ans == [2,1,7,1,1,2])
+		info = cf_cache.cache_info ()['cntd_frac']
+		self.failUnless (info.hits == 3 and info.misses == 3)
+										# results are copies
+		ans[0] = 0
+		self.failUnless (cntd_frac (Surd (81, 0, 43, 2)) == [1,1,7,1,1,2])
+
+	def testCfFiniteFundUnit (self):
+		ans = cf_finite (Surd (5, 1, 1, 2), 4)
+		self.failUnless (ans == [6,2,2,2])
+		ans = cf_finite (Surd (0, 1, 1, 2), 4)
+		self.failUnless (ans == [1,2,2,2])
+		self.failUnless (cf_cache.cache_info ()['cf_finite'].hits == 1)
+		ans = fund_unit (94)
+		ans.mult (ans)
+		self.failUnless (str(fund_unit (94)) == str(Surd (2143295, 221064, 1, 94)))
+		self.failUnless (cf_cache.cache_info ()['fund_unit'].hits == 1)
+		cf_cache.cache_clear ()
+		self.failUnless (cf_cache.cache_info ()['fund_unit'].currsize == 0)
+
+
+def main():
+	unittest.main()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,250 @@
+#-------------------------------------------------------------------------------
+#  Module for opt-in counters and timings of the Surd and LFT arithmetic.
+#
+#  Copyright 2026 Jesse I. Deutsch
+#
+#   $Id:$
+#-------------------------------------------------------------------------------
+
+
+import time
+from contextlib import contextmanager
+
+import surd
+import linfractrans
+import cntd_frac
+
+
+										# functions timed when enabled,
+										# as (module, name)
+TIMED = [(cntd_frac, 'cntd_frac'), (cntd_frac, 'cf_finite'), \
+			(cntd_frac, 'cflist_to_surd'), (cntd_frac, 'cflist_to_rtnl'), \
+			(cntd_frac, 'cf_convergent'), (surd, 'fund_unit'), \
+			(surd, 'regulator')]
+
+										# collected data, see snapshot
+counters = {}
+timings = {}
+steps = {}
+last = {}
+max_bits = 0
+
+										# originals of the wrapped
+										# functions, empty when disabled
+_saved = []
+
+
+
+def _count (name):
+		counters[name] = counters.get (name, 0) + 1
+
+
+####----- end function -----
+
+
+def _bits (*vals):
+		""" Note the largest bit length among vals. """
+
+		global max_bits
+		for v in vals:
+			if v.bit_length () > max_bits:
+				max_bits = v.bit_length ()
+
+
+####----- end function -----
+
+
+def _add_steps (name, k):
+		entry = steps.setdefault (name, [0, 0, 0])
+		entry[0] = entry[0] + 1
+		entry[1] = entry[1] + k
+		entry[2] = max (entry[2], k)
+
+
+####----- end function -----
+
+
+def _wrap_surd_normalize (orig):
+		def normalize (self):
+			_count ('surd_normalize')
+			orig (self)
+			_bits (self.a, self.b, self.d)
+		return normalize
+
+
+####----- end function -----
+
+
+def _wrap_lft_normalize (orig):
+		def normalize (self):
+			_count ('lft_normalize')
+			orig (self)
+			_bits (self.a, self.b, self.c, self.d)
+		return normalize
+
+
+####----- end function -----
+
+
+def _wrap_gcd (orig):
+		def euclid_alg (a, b, backend=None):
+			_count ('gcd')
+			return orig (a, b, backend)
+		return euclid_alg
+
+
+####----- end function -----
+
+
+def _wrap_fixed_pts (orig):
+		""" Record the LFT and discriminant, once printed by fixed_pts. """
+
+		def fixed_pts (self):
+			a, b, c, d = self.a, self.b, self.c, self.d
+			pts = orig (self)
+			_count ('fixed_pts')
+			last['fixed_pts'] = {'a': a, 'b': b, 'c': c, 'd': d, \
+									'disc': (d - a)**2 + 4 * b * c}
+			return pts
+		return fixed_pts
+
+
+####----- end function -----
+
+
+def _wrap_timed (name, orig):
+		""" Time calls of orig, and count the terms of expansions. """
+
+		def timed (*args, **kwargs):
+			start = time.perf_counter ()
+			try:
+				return_val = orig (*args, **kwargs)
+			finally:
+				entry = timings.setdefault (name, [0, 0.0])
+				entry[0] = entry[0] + 1
+				entry[1] = entry[1] + time.perf_counter () - start
+										# partial quotients found
+			if name in ('cntd_frac', 'cf_finite') \
+					and isinstance (return_val, list):
+				k = len (return_val)
+				if k > 0 and isinstance (return_val[-1], list):
+					k = k - 1 + len (return_val[-1])
+				_add_steps (name, k)
+			return return_val
+		timed.__name__ = orig.__name__
+		timed.__doc__ = orig.__doc__
+		return timed
+
+
+####----- end function -----
+
+
+def _patch (owner, name, new):
+		_saved.append ((owner, name, getattr (owner, name)))
+		setattr (owner, name, new)
+
+
+####----- end function -----
+
+
+def enable ():
+		""" Start collecting.
+
+		The instrumented versions are swapped in for Surd.normalize,
+		LFT.normalize, LFT.fixed_pts, the euclid_alg used by those,
+		and the functions in TIMED.  disable () puts the originals
+		back, so there is no cost at all while disabled.  Callers
+		that imported a timed function by name before enable ()
+		keep the plain version.
+		"""
+
+		if _saved:
+			return
+		_patch (surd.Surd, 'normalize', \
+					_wrap_surd_normalize (surd.Surd.normalize))
+		_patch (linfractrans.LFT, 'normalize', \
+					_wrap_lft_normalize (linfractrans.LFT.normalize))
+		_patch (linfractrans.LFT, 'fixed_pts', \
+					_wrap_fixed_pts (linfractrans.LFT.fixed_pts))
+		for owner in (surd, linfractrans):
+			_patch (owner, 'euclid_alg', _wrap_gcd (owner.euclid_alg))
+		for owner, name in TIMED:
+			_patch (owner, name, _wrap_timed (name, getattr (owner, name)))
+
+
+####----- end function -----
+
+
+def disable ():
+		""" Stop collecting.  The data so far is kept. """
+
+		while _saved:
+			owner, name, orig = _saved.pop ()
+			setattr (owner, name, orig)
+
+
+####----- end function -----
+
+
+def is_enabled ():
+		return len (_saved) > 0
+
+
+####----- end function -----
+
+
+def reset ():
+		""" Clear all collected data. """
+
+		global max_bits
+		counters.clear ()
+		timings.clear ()
+		steps.clear ()
+		last.clear ()
+		max_bits = 0
+
+
+####----- end function -----
+
+
+def snapshot ():
+		""" Copy of the data collected so far, as a dict.
+
+			counters -- calls of surd_normalize, lft_normalize,
+						gcd and fixed_pts
+			max_bits -- largest coefficient bit length after a
+						normalize
+			timings  -- name: [calls, seconds]
+			steps    -- name: [expansions, partial quotients, most
+						in one expansion]
+			last     -- data of the last call, e.g. fixed_pts: the
+						LFT entries and discriminant
+		"""
+
+		return {'counters': dict (counters), 'max_bits': max_bits, \
+				'timings': {k: list (v) for k, v in timings.items ()}, \
+				'steps': {k: list (v) for k, v in steps.items ()}, \
+				'last': {k: dict (v) for k, v in last.items ()}}
+
+
+####----- end function -----
+
+
+@contextmanager
+def collecting ():
+		""" Enable for a with block, yielding the snapshot function.
+
+		Data is reset on entry, and collection stops on exit.
+		"""
+
+		was_enabled = is_enabled ()
+		reset ()
+		enable ()
+		try:
+			yield snapshot
+		finally:
+			if not was_enabled:
+				disable ()
+
+
+####----- end function -----
@@ -0,0 +1,59 @@
+#-----------------------------------------------------------
+# cf_stats_test -- unit tests for the instrumentation.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-----------------------------------------------------------
+
+
+import unittest
+import cf_stats
+import cntd_frac
+from cntd_frac import Surd
+
+
+class Cf_Stats_Tests (unittest.TestCase):
+
+	def tearDown (self):
+		cf_stats.disable ()
+		cf_stats.reset ()
+
+	def testDisabled (self):
+		orig = cntd_frac.Surd.normalize
+		cf_stats.enable ()
+		self.failUnless (cf_stats.is_enabled ())
+		self.failIf (cntd_frac.Surd.normalize is orig)
+		cf_stats.disable ()
+		self.failUnless (cntd_frac.Surd.normalize is orig)
+		cntd_frac.cntd_frac (Surd (0, 1, 1, 97))
+		self.failUnless (cf_stats.snapshot ()['counters'] == {})
+
+	def testCounters (self):
+		with cf_stats.collecting () as snap:
+			ans = cntd_frac.cntd_frac (Surd (0, 1, 1, 97))
+			x = Surd (1, 2, 5, 3)
+			x.mult (x)
+		data = snap ()
+		self.failUnless (ans == [9,[1,5,1,1,1,1,1,1,5,1,18]])
+		self.failUnless (data['counters']['surd_normalize'] >= 2)
+		self.failUnless (data['counters']['gcd'] >= 2)
+		self.failUnless (data['steps']['cntd_frac'] == [1, 12, 12])
+		self.failUnless (data['timings']['cntd_frac'][0] == 1)
+		self.failUnless (data['max_bits'] == 5)
+		self.failIf (cf_stats.is_enabled ())
+
+	def testFixedPts (self):
+		with cf_stats.collecting () as snap:
+			ans = cntd_frac.cflist_pureperiod_to_surd ([1,2])
+		self.failUnless (str(ans) == str(Surd (1, 1, 2, 3)))
+		fp = snap ()['last']['fixed_pts']
+		self.failUnless ([fp['a'], fp['b'], fp['c'], fp['d']] == [3, 1, 2, 1])
+		self.failUnless (fp['disc'] == 12)
+		self.failUnless (snap ()['counters']['lft_normalize'] >= 1)
+
+
+def main():
+	unittest.main()
+
+
+if __name__ == '__main__':
+	main()
@@ -12,6 +12,16 @@ from surd import *
 import linfractrans
 
 
+										# runs of terms multiplied out
+										# directly in cflist_matrix
+CFLIST_LEAF = 16
+
+										# SqrtIndex consulted by cntd_frac
+										# for sqrt(D), see sqrt_index.py
+sqrt_index = None
+										# CfCache used by cntd_frac and
+										# cf_finite, see cf_cache.py
+result_cache = None
 
 
 
@@ -24,25 +34,100 @@ def cf_finite (x, bnd):
 		expansion.
 		"""
 
-		cf_list = []
-		cf = Surd (x.a, x.b, x.d, x.r)
-		cnt = 0
-		while (cnt < bnd):
-										# take floor, then reciprocal
-										# r**0.5 won't work for large r
-			cf_top_approx = cf.a + cf.b * cf.r**0.5
-									# __floordiv__ is `//'
-			cf_floor = cf_top_approx // cf.d
-			cf_list.append (int(cf_floor))
-										# get into range [0,1)
-			cf.a = cf.a - cf_floor * cf.d
-										# zero possible in rational case
-			if cf.a == 0 and cf.b == 0:
-				return cf_list				
-
-			cf.div_replace (Surd(1,0,1,cf.r), cf)
-			cnt = cnt + 1
-		return cf_list				
+		if result_cache is not None:
+			return result_cache.cf_finite (x, bnd, \
+											lambda y: cf_iter (y).take (bnd))
+		return cf_iter (x).take (bnd)
+
+
+####----- end function -----
+
+
+
+class CfIter:
+		""" Stream of the partial quotients of a Surd.
+
+		An iterator producing the continued fraction of x one
+		term at a time.  It can be left and resumed at any point,
+		and take (k) gives the next k terms.  Nothing but the
+		current complete quotient is kept, as integers P, Q with
+						x_n = (P + sqrt(D)) / Q ,
+		so memory does not grow with the number of terms.
+		For irrational x, period_start is set once the period
+		has begun and period_length once it has closed, i.e. once
+		the terms so far contain a whole period.  A rational x
+		stops the iteration when its expansion ends.
+		"""
+
+		def __init__ (self, x):
+			self.count = 0
+			self.period_start = None
+			self.period_length = None
+			self.rational = (x.b == 0)
+			if self.rational:
+				self.P, self.Q = x.a, x.d
+				return
+			self.P, self.Q, self.D = x.pq_form ()
+			self.rt_D = isqrt (self.D)
+			self.check_reduced ()
+
+		def __iter__ (self):
+			return self
+
+		def __next__ (self):
+			if self.rational:
+				if self.Q == 0:
+					raise StopIteration
+				cf_floor = self.P // self.Q
+				self.P, self.Q = self.Q, self.P - cf_floor * self.Q
+				self.count = self.count + 1
+				return cf_floor
+										# exact integer floor, then
+										# reciprocal of x - cf_floor
+			cf_floor = pq_floor (self.P, self.Q, self.rt_D)
+			self.P = cf_floor * self.Q - self.P
+			self.Q = (self.D - self.P * self.P) // self.Q
+			self.count = self.count + 1
+			if self.period_start is None:
+				self.check_reduced ()
+			elif self.period_length is None:
+				if self.P == self.P0 and self.Q == self.Q0:
+					self.period_length = self.count - self.period_start
+			return cf_floor
+
+		def check_reduced (self):
+										# x_n reduced, x_n > 1 and
+										# -1 < conj(x_n) < 0, iff it is
+										# purely periodic, so the first
+										# reduced x_n starts the period
+			P, Q, rt_D = self.P, self.Q, self.rt_D
+			if Q > 0 and P <= rt_D and rt_D < P + Q and Q <= P + rt_D:
+				self.period_start = self.count
+				self.P0, self.Q0 = P, Q
+
+		def period_closed (self):
+			return self.period_length is not None
+
+		def take (self, k):
+			""" List of the next (at most) k partial quotients. """
+			cf_list = []
+			for cnt in range (k):
+				try:
+					cf_list.append (next (self))
+				except StopIteration:
+					break
+			return cf_list
+
+#----- end of class -------
+
+
+def cf_iter (x):
+		""" Iterator over the partial quotients of Surd x.
+
+		See CfIter.
+		"""
+
+		return CfIter (x)
 
 
 ####----- end function -----
@@ -60,54 +145,303 @@ def cntd_frac (x):
 		fraction for this Surd.
 		"""
 
+		if result_cache is not None:
+			return result_cache.cntd_frac (x, _cntd_frac)
+		return _cntd_frac (x)
+
+
+####----- end function -----
+
+
+def _cntd_frac (x):
+		""" cntd_frac without the cache. """
+
+										# chunk 0 never yields, so the
+										# generator finishes on first next
+		steps = cntd_frac_steps (x, 0)
+		try:
+			next (steps)
+		except StopIteration as done:
+			return done.value
+
+
+####----- end function -----
+
+
+def cntd_frac_steps (x, chunk):
+		""" Resumable form of cntd_frac.
+
+		A generator doing the work of cntd_frac (x), which yields
+		(None) after every chunk partial quotients so that a caller
+		such as an event loop can pause it.  The expansion is the
+		generator's return value, i.e. StopIteration.value.  With
+		chunk = 0 it never yields.
+		"""
+
+		Surd.settle (x)
 		cf_list = []
-		cf = Surd (x.a, x.b, x.d, x.r)
 		
 										# case of rational number
 		if x.b == 0:
+			p, q = x.a, x.d
 			while (1):
 										# take floor, then reciprocal
 										# __floordiv__ is `//'
-				cf_floor = cf.a // cf.d
-										# int converts e.g. 5.0 to 5
-				cf_list.append (int(cf_floor))
-										# get into range [0,1)
-				cf.a = cf.a - cf_floor * cf.d
+				cf_floor = p // q
+				cf_list.append (cf_floor)
 										# zero means end of contd frac
-				if cf.a == 0:
+				p, q = q, p - cf_floor * q
+				if q == 0:
 					return cf_list				
-
-				cf.div_replace (Surd(1,0,1,cf.r), cf)
+				if chunk and len (cf_list) % chunk == 0:
+					yield
 					
 										# irrational quadratic surd
 		else:
-			cf_partial_list = []
-			cf_partial_list.append (str(cf))
+										# x = (P + sqrt(D)) / Q and each
+										# complete quotient has the same
+										# D, so the exact (P, Q) pair is
+										# the state.  Map each state to
+										# its index; a repeated key marks
+										# the start of the period.
+										# Linear in the period length.
+										# sqrt(D) from the index file
+			if sqrt_index is not None and x.a == 0 and x.b == 1 \
+					and x.d == 1:
+				cf_list = sqrt_index.lookup (x.r)
+				if cf_list is not None:
+					return cf_list
+				cf_list = []
+			P, Q, D = x.pq_form ()
+										# sqrt(D) and (1 + sqrt(D))/2
+			if (P, Q) == (0, 1) or ((P, Q) == (1, 2) and D % 4 == 1):
+				return (yield from half_period_steps (P, Q, D, chunk))
+			rt_D = isqrt (D)
+			cf_seen = {}
+			cf_seen[(P, Q)] = 0
 
 			while ( 1 ):
-										# take floor, then reciprocal
-										# r**0.5 won't work for large r
-				cf_top_approx = cf.a + cf.b * cf.r**0.5
-										# __floordiv__ is `//'
-				cf_floor = cf_top_approx // cf.d
-				cf_floor = int(cf_floor)
+										# exact integer floor
+				cf_floor = pq_floor (P, Q, rt_D)
 				cf_list.append (cf_floor)
-										# get into range [0,1)
-				cf.a = cf.a - cf_floor * cf.d
-
-				cf.div_replace (Surd(1,0,1,cf.r), cf)
-				idx = -1
-				#                       -----Debugging--------
-				#  print " ### cf_partial_list: ", cf_partial_list
-				#
-				for string in cf_partial_list:
-					idx = idx + 1
-					if string == str(cf):
-						cf_list_repeat = cf_list[:idx]
-						cf_list_repeat.append(cf_list[idx:])
-						return cf_list_repeat
-										# not yet in the list
-				cf_partial_list.append (str(cf))
+										# reciprocal of x - cf_floor
+				P = cf_floor * Q - P
+				Q = (D - P * P) // Q
+				idx = cf_seen.get ((P, Q))
+				if idx is not None:
+					cf_list_repeat = cf_list[:idx]
+					cf_list_repeat.append(cf_list[idx:])
+					return cf_list_repeat
+										# not yet seen
+				cf_seen[(P, Q)] = len (cf_list)
+				if chunk and len (cf_list) % chunk == 0:
+					yield
+
+
+####----- end function -----
+
+
+def half_period_steps (P, Q, D, chunk):
+		""" cntd_frac_steps for sqrt(D) and (1 + sqrt(D))/2.
+
+		(P, Q) is (0, 1), or (1, 2) with D = 1 mod 4.  The period
+		is then a palindrome followed by 2*a_0, or by 2*a_0 - 1
+		for (1 + sqrt(D))/2.  With x_i = (P_i + sqrt(D)) / Q_i the
+		complete quotients, x_0 = x, the middle of the period shows
+		as the first i with
+			Q_i = Q_(i+1)          -- odd length 2i + 1, or
+			P_i = P_(i+1), i > 0   -- even length 2i ,
+		and the second half is the first read backwards.  So only
+		half the period is computed and stored.
+		"""
+
+		rt_D = isqrt (D)
+		a_0 = pq_floor (P, Q, rt_D)
+		if P == 0:
+			last = 2 * a_0
+		else:
+			last = 2 * a_0 - 1
+		cf_half = []
+		cf_floor = a_0
+		while (1):
+			P_next = cf_floor * Q - P
+			Q_next = (D - P_next * P_next) // Q
+			if Q == Q_next:
+				period = cf_half + cf_half[::-1]
+				break
+			if P == P_next and len (cf_half) > 0:
+				period = cf_half + cf_half[-2::-1]
+				break
+			P, Q = P_next, Q_next
+			cf_floor = pq_floor (P, Q, rt_D)
+			cf_half.append (cf_floor)
+			if chunk and len (cf_half) % chunk == 0:
+				yield
+		period.append (last)
+										# only for (1 + sqrt(5))/2 is
+										# a_0 = last, purely periodic
+		if a_0 == last:
+			return [period[-1:] + period[:-1]]
+		return [a_0, period]
+
+
+####----- end function -----
+
+
+def cflist_iter (cflist):
+		""" Iterator over the terms of a continued fraction list.
+
+		The list is in the format returned by cntd_frac, so if its
+		last element is a list, that period repeats without end.
+		"""
+
+		if len (cflist) > 0 and isinstance (cflist[-1], list):
+			for term in cflist[:-1]:
+				yield term
+			while (1):
+				for term in cflist[-1]:
+					yield term
+		else:
+			for term in cflist:
+				yield term
+
+
+####----- end function -----
+
+
+def convergents (x, as_surd=False, r=2):
+		""" Iterator over the convergents of a continued fraction.
+
+		x is a Surd, a list in the format of cntd_frac, or any
+		iterable of partial quotients.  Each convergent p_n / q_n
+		comes from
+			p_n = a_n p_(n-1) + p_(n-2),  q_n = a_n q_(n-1) + q_(n-2),
+		so each term costs two multiplications and no gcd, as
+		p_n and q_n are already coprime.  Yields pairs [p, q], or
+		Surds (p, 0, q, r) if as_surd is set; r defaults to x.r
+		for a Surd.
+		"""
+
+		if isinstance (x, Surd):
+			terms = cf_iter (x)
+			r = x.r
+		elif isinstance (x, list):
+			terms = cflist_iter (x)
+		else:
+			terms = x
+		p, p_prev = 1, 0
+		q, q_prev = 0, 1
+		for term in terms:
+			p, p_prev = term * p + p_prev, p
+			q, q_prev = term * q + q_prev, q
+			if as_surd:
+				yield Surd (p, 0, q, r)
+			else:
+				yield [p, q]
+
+
+####----- end function -----
+
+
+def cflist_matrix (terms, lo=0, hi=None):
+		""" Product of the matrices [[a_i, 1], [1, 0]], for terms[lo:hi].
+
+		Returns [p, p1, q, q1], the matrix [[p, p1], [q, q1]] with
+		p/q the value of the run of terms and p1/q1 the convergent
+		before it.  The product is formed by binary splitting, so
+		the big multiplications are between numbers of about the
+		same size, and no gcds are taken.  An empty run gives the
+		identity.
+		"""
+
+		if hi is None:
+			hi = len (terms)
+										# short runs directly
+		if hi - lo <= CFLIST_LEAF:
+			p, p1, q, q1 = 1, 0, 0, 1
+			for i in range (lo, hi):
+				p, p1, q, q1 = p * terms[i] + p1, p, q * terms[i] + q1, q
+			return [p, p1, q, q1]
+		mid = (lo + hi) // 2
+		a, b, c, d = cflist_matrix (terms, lo, mid)
+		e, f, g, h = cflist_matrix (terms, mid, hi)
+		return [a * e + b * g, a * f + b * h, c * e + d * g, c * f + d * h]
+
+
+####----- end function -----
+
+
+def cflist_lft (terms):
+		""" Linear fractional transformation of a run of terms.
+
+		For terms a_1, ..., a_k returns the LFT
+			z -> a_1 + 1/(a_2 + ... + 1/(a_k + 1/z))
+			   = (p_k z + p_(k-1)) / (q_k z + q_(k-1)) ,
+		the product of the matrices [[a_i, 1], [1, 0]].
+		"""
+
+		return linfractrans.LFT (*cflist_matrix (terms))
+
+
+####----- end function -----
+
+
+def cf_convergent (cflist, k):
+		""" The k-th convergent [p_k, q_k] of a continued fraction list.
+
+		cflist is in the format of cntd_frac, and k counts from 0
+		as in convergents.  For a periodic list the LFT of one
+		period is raised to the needed power by repeated squaring,
+		so the cost is O(log k) LFT compositions plus one pass
+		over the list, without stepping through every term.
+		"""
+
+		if len (cflist) > 0 and isinstance (cflist[-1], list):
+			pre, period = cflist[:-1], cflist[-1]
+		else:
+			pre, period = cflist, []
+		if k < len (pre):
+			lft = cflist_lft (pre[:k + 1])
+			return [lft.a, lft.c]
+		if len (period) == 0:
+			raise IndexError ("convergent beyond end of finite expansion")
+										# k + 1 terms: the pre-period,
+										# j whole periods, then rem terms
+		j, rem = divmod (k + 1 - len (pre), len (period))
+		lft = cflist_lft (pre)
+		per = cflist_lft (period)
+		per.power (j)
+		lft.compose (per)
+		lft.compose (cflist_lft (period[:rem]))
+		return [lft.a, lft.c]
+
+
+####----- end function -----
+
+
+def fund_unit_power (m, j):
+		""" The j-th power of the fundamental unit of Q(sqrt(m)).
+
+		If the expansion of w (sqrt(m), or (1 + sqrt(m))/2 for
+		m = 1 mod 4) has period L, then the convergent p/q with
+		index j*L - 1 gives the j-th power of the unit as in
+		fund_unit.  It is found with cf_convergent, so the cost is
+		O(log j) LFT compositions.  Needs j >= 0.
+		"""
+
+		error = unit_check (m)
+		if error is not None:
+			return error
+		if j == 0:
+			return Surd (1, 0, 1, m)
+		if m % 4 == 1:
+			cflist = cntd_frac (Surd (1, 1, 2, m))
+		else:
+			cflist = cntd_frac (Surd (0, 1, 1, m))
+		p, q = cf_convergent (cflist, j * len (cflist[-1]) - 1)
+		if m % 4 == 1:
+			return Surd (2 * p - q, q, 2, m)
+		return Surd (p, q, 1, m)
 
 
 ####----- end function -----
@@ -118,21 +452,18 @@ def cflist_to_rtnl (cflist, r):
 
 		We take a list, interpreted as a finite continued fraction
 		expansion, and return the corresponding rational number.
-		The output is a Surd, however. 
+		The output is a Surd, however.  The numerator and
+		denominator come from the product tree of cflist_matrix,
+		with one gcd at the end, so long lists are not quadratic
+		in the size of the result.
 		Variables -- r is a dummy for the quadratic term.
 		"""
 
-										# initialize with bottom int
-										# and work your way to the top.
-										# This accounts for cflist[-1]
-										# and the indices 2, etc.
-		rtnl = Surd (cflist[-1], 0, 1, r)
-		for i in range (2, len(cflist) + 1):
-			rtnl.div_replace (Surd(1,0,1,r), rtnl)
-			rtnl.add (Surd (cflist[-i], 0, 1, r))
+		if len (cflist) == 0:
+			raise IndexError ("empty continued fraction")
+		p, p1, q, q1 = cflist_matrix (cflist)
 
-
-		return rtnl
+		return Surd (p, 0, q, r)
 
 
 ####----- end function -----
@@ -145,19 +476,11 @@ def cflist_pureperiod_to_surd (cflist):
 		fraction expansion, and return the corresponding surd.
 		The strategy is to work with what are essentially linear
 		fractional transformations, and find the fixed points of
-		them.
+		them.  The LFT of the period is formed by cflist_lft.
 			Variables -- none.
 		"""
 
-										# initialize at bottom to x
-		temp = linfractrans.LFT (1,0,0,1)
-										# start with bottom int and
-										# work to the top.  This accounts
-										# for cflist[-i].
-		for i in range (1, len(cflist) + 1):
-			temp.reciprocal()
-			temp.add_const (cflist[-i])
-
+		temp = cflist_lft (cflist)
 										# get the 2 fixed points
 		pp_surd = temp.fixed_pts()
 										# return larger of fixed points
@@ -186,20 +509,16 @@ def cflist_to_surd (cflist):
 
 										## purely periodic part at bottom
 		elif isinstance(cflist[-1], list):
-			cf = cflist_pureperiod_to_surd (cflist[-1])
-			cf_r = cf.r
-										# and work your way to the top.
-										# This accounts for cflist[-1]
-										# and the indices 2, etc.
-			for i in range (2, len(cflist) + 1):
-				cf.div_replace (Surd(1,0,1,cf_r), cf)
-				cf.add (Surd (cflist[-i], 0, 1, cf_r))
-
+			y = cflist_pureperiod_to_surd (cflist[-1])
+										# apply the LFT of the pre-period,
+										# (p y + p1) / (q y + q1)
+			p, p1, q, q1 = cflist_matrix (cflist, 0, len (cflist) - 1)
+			cf = Surd (p * y.a + p1 * y.d, p * y.b, 1, y.r)
+			cf.div (Surd (q * y.a + q1 * y.d, q * y.b, 1, y.r))
 			return cf
 
 		else:
-			print ("### Type error")
-			return
+			raise TypeError ("last element of cflist must be int or list")
 
 
 ####----- end function -----
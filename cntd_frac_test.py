@@ -21,6 +21,86 @@ class Surd_Tests (unittest.TestCase):
 		self.failUnless (ans == 521371444217943838413)
 		ans = isqrt(87872384752987548725983479287298472897)
 		self.failUnless (ans == 9374027136347939372)
+		k = 100003
+		ans = isqrt(k*k - 1)
+		self.failUnless (ans == k - 1)
+		ans = isqrt(10**50 - 1)
+		self.failUnless (ans == 10**25 - 1)
+
+	def testSurdFloor (self):
+		self.failUnless (Surd (1,1,2,5).floor() == 1)
+		self.failUnless (Surd (1,-1,2,5).floor() == -1)
+		self.failUnless (Surd (-7,0,2,5).floor() == -4)
+		a = Surd (0, 10**20, 1, 10**40 + 1)
+		self.failUnless (a.floor() == 10**40)
+		a = Surd (0, -10**20, 1, 10**40 + 1)
+		self.failUnless (a.floor() == -10**40 - 1)
+
+	def testSurdLazy (self):
+		Surd.lazy = True
+		try:
+			x = Surd (1, 1, 2, 5)
+			x.mult (Surd (3, 1, 2, 5))
+			x.div (Surd (2, 0, 1, 5))
+			self.failUnless ([x.a, x.b, x.d] == [-16, -8, -16])
+			self.failUnless (str(x) == str(Surd (2, 1, 2, 5)))
+			self.failUnless ([x.a, x.b, x.d] == [2, 1, 2])
+			y = Surd (1, 1, 2, 5)
+			y.sub (Surd (1, 1, 2, 5))
+			self.failUnless (y.floor () == 0 and y.d == 1)
+			Surd.lazy_bits = 8
+			z = Surd (1, 1, 2, 5)
+			for i in range (3):
+				z.mult (Surd (1, 1, 2, 5))
+			self.failUnless ([z.a, z.b, z.d] == [56, 24, 16])
+										# 176 has 8 bits
+			z.mult (Surd (1, 1, 2, 5))
+			self.failUnless ([z.a, z.b, z.d] == [11, 5, 2])
+		finally:
+			Surd.lazy = False
+			Surd.lazy_bits = 256
+
+	def testSurdReciprocal (self):
+		tau = Surd (1,1,2,5)
+		tau.reciprocal()
+		self.failUnless (str(tau) == str(Surd (-1,1,2,5)))
+		a = Surd (81, 0, 43, 2)
+		a.reciprocal()
+		self.failUnless (str(a) == str(Surd (43, 0, 81, 2)))
+		a = Surd (0, 0, 1, 2)
+		self.assertRaises (ZeroDivisionError, a.reciprocal)
+
+	def testSurdIntShift (self):
+		tau = Surd (1,1,2,5)
+		tau.sub_int(1)
+		self.failUnless (str(tau) == str(Surd (-1,1,2,5)))
+		tau.add_int(3)
+		self.failUnless (str(tau) == str(Surd (5,1,2,5)))
+		self.assertRaises (AttributeError, setattr, tau, 'temp_a', 0)
+
+	def testFundUnit (self):
+		ans = fund_unit (5)
+		self.failUnless (str(ans) == str(Surd (1,1,2,5)))
+		ans = fund_unit (94)
+		self.failUnless (str(ans) == str(Surd (2143295, 221064, 1, 94)))
+		ans = fund_unit (661)
+		self.failUnless (str(ans) == str(Surd (1789539, 69605, 2, 661)))
+		ans = fund_unit (12)
+		self.failUnless (ans == "ERROR: m must be square free")
+		ans = fund_unit (2 * 3 * 5 * 7 * 11 * 13 * 17 * 19 * 23 * 29 * 31)
+		self.failUnless (ans.a * ans.a - ans.r * ans.b * ans.b == ans.d**2)
+
+	def testFundUnitCompact (self):
+		ans = fund_unit_compact (94)
+		self.failUnless (len(ans) == 16)
+		prod = Surd (1, 0, 1, 94)
+		for factor in ans:
+			prod.mult (factor)
+		self.failUnless (str(prod) == str(fund_unit (94)))
+		ans = regulator (94)
+		self.failUnless (abs (ans - 15.271002) < 1e-6)
+		ans = regulator (661)
+		self.failUnless (abs (ans - 14.397469) < 1e-6)
 
 	def testCfFinite (self):
 		tau = Surd (1,1,2,5)
@@ -37,7 +117,29 @@ class Surd_Tests (unittest.TestCase):
 		a = Surd (0, 1, 1, 97)
 		ans = cf_finite(a, 12)
 		self.failUnless (ans == [9,1,5,1,1,1,1,1,1,5,1,18])
+		n = 10**22
+		a = Surd (0, 1, 1, n*n + 2)
+		ans = cf_finite(a, 5)
+		self.failUnless (ans == [n, n, 2*n, n, 2*n])
+
 
+	def testCfIter (self):
+		rt97 = cf_iter (Surd (0, 1, 1, 97))
+		ans = rt97.take (3)
+		self.failUnless (ans == [9,1,5])
+		self.failUnless (rt97.period_start == 1)
+		self.failIf (rt97.period_closed ())
+		ans = rt97.take (9)
+		self.failUnless (ans == [1,1,1,1,1,1,5,1,18])
+		self.failUnless (rt97.period_length == 11)
+		self.failUnless (next (rt97) == 1)
+		a = cf_iter (Surd (81, 0, 43, 2))
+		self.failUnless (list (a) == [1,1,7,1,1,2])
+		self.failUnless (a.period_start is None)
+		tau = cf_iter (Surd (1,1,2,5))
+		self.failUnless (tau.period_start == 0)
+		self.failUnless (tau.take (2) == [1,1])
+		self.failUnless (tau.period_length == 1)
 
 	def testCntdFrac (self):
 		tau = Surd (1,1,2,5)
@@ -55,6 +157,73 @@ class Surd_Tests (unittest.TestCase):
 		b = Surd (97, 0, 22, 2)
 		ans = cntd_frac(b)
 		self.failUnless (ans == [4,2,2,4])
+		rt94 = Surd (0, 1, 1, 94)
+		ans = cntd_frac(rt94)
+		self.failUnless (ans == [9,[1,2,3,1,1,5,1,8,1,5,1,1,3,2,1,18]])
+		ans = cntd_frac(Surd (0, 1, 1, 1000099))
+		self.failUnless (len(ans[1]) == 2174)
+		self.failUnless (ans[1][-1] == 2 * ans[0])
+		n = 10**21
+		ans = cntd_frac(Surd (0, 1, 1, n*n + 1))
+		self.failUnless (ans == [n, [2*n]])
+
+
+	def testHalfPeriod (self):
+										# x - 1 takes the general path
+		for D in range (2, 400):
+			if isqrt (D)**2 == D:
+				continue
+			ans = cntd_frac (Surd (0, 1, 1, D))
+			shift = cntd_frac (Surd (-1, 1, 1, D))
+			self.failUnless (ans == [shift[0] + 1, shift[1]])
+			if D % 4 == 1 and D != 5:
+				ans = cntd_frac (Surd (1, 1, 2, D))
+				shift = cntd_frac (Surd (-1, 1, 2, D))
+				self.failUnless (ans == [shift[0] + 1, shift[1]])
+		self.failUnless (cntd_frac (Surd (1, 1, 2, 5)) == [[1]])
+		self.failUnless (cntd_frac (Surd (1, 1, 2, 73)) == \
+							[4, [1, 3, 2, 1, 1, 2, 3, 1, 7]])
+
+
+	def testConvergents (self):
+		rt2 = convergents (Surd (0,1,1,2))
+		ans = [next (rt2) for i in range (5)]
+		self.failUnless (ans == [[1,1],[3,2],[7,5],[17,12],[41,29]])
+		ans = list (convergents ([1,1,7,1,1,2]))
+		self.failUnless (ans[-1] == [81, 43])
+		ans = list (convergents ([1,1,7,1,1,2], as_surd=True))
+		self.failUnless (str(ans[-1]) == str(Surd (81, 0, 43, 2)))
+		rt97 = convergents ([9,[1,5,1,1,1,1,1,1,5,1,18]])
+		for i in range (11):
+			ans = next (rt97)
+		self.failUnless (ans == [5604, 569])
+		self.failUnless (ans[0]**2 - 97 * ans[1]**2 == -1)
+		for cnt in range (1, 20):
+			ans = cflist_to_rtnl (cf_finite (Surd (0,1,1,97), cnt), 97)
+			cnvg = list (convergents (cf_iter (Surd (0,1,1,97)).take (cnt)))
+			self.failUnless ([ans.a, ans.d] == cnvg[-1])
+
+	def testCfConvergent (self):
+		cfl = [9,[1,5,1,1,1,1,1,1,5,1,18]]
+		rt97 = convergents (cfl)
+		for k in range (50):
+			self.failUnless (cf_convergent (cfl, k) == next (rt97))
+		self.failUnless (cf_convergent (cfl, 10) == [5604, 569])
+		self.failUnless (cf_convergent ([1,1,7,1,1,2], 5) == [81, 43])
+		self.assertRaises (IndexError, cf_convergent, [1,1,7,1,1,2], 6)
+		p, q = cf_convergent ([1,[2]], 1000)
+		self.failUnless (p*p - 2*q*q == -1)
+
+
+	def testFundUnitPower (self):
+		for m in [2, 5, 13, 94, 97, 103]:
+			unit = fund_unit (m)
+			pwr = Surd (1, 0, 1, m)
+			for j in range (5):
+				self.failUnless (str(fund_unit_power (m, j)) == str(pwr))
+				pwr.mult (unit)
+		ans = fund_unit_power (2, 100)
+		self.failUnless (str(ans.norm ()) == str(Surd (1, 0, 1, 2)))
 
 
 	def testCflistToRtnl (self):
@@ -62,6 +231,12 @@ class Surd_Tests (unittest.TestCase):
 		self.failUnless (str(ans) == str(Surd (5, 0, 3, 2)))
 		ans = cflist_to_rtnl([1,1,1,1,1], 2)
 		self.failUnless (str(ans) == str(Surd (8, 0, 5, 2)))
+										# long list, product tree
+		ans = cflist_to_rtnl([1] * 1000, 2)
+		cnvg = cf_convergent ([[1]], 999)
+		self.failUnless ([ans.a, ans.d] == cnvg)
+		ans = cflist_matrix ([2,3,4])
+		self.failUnless (ans == [30, 7, 13, 3])
 
 
 	def testCflistPurePeriodToSurd (self):
@@ -83,6 +258,7 @@ class Surd_Tests (unittest.TestCase):
 										# 2 is default radix
 		ans = cflist_to_surd([1,1,7,1,1,2])
 		self.failUnless (str(ans) == str(Surd (81, 0, 43, 2)))
+		self.assertRaises (TypeError, cflist_to_surd, [1, 2.5])
 		
 
 		
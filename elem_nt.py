@@ -5,22 +5,73 @@
 #-------------------------------------------------------------
 
 
+from array import array
+
+import factorize
+from nt_backend import get_backend
+
+
 
 def ord_modulo (a, n):
     """ Compute the order of a modulo n.
 
     Computes the order of rational int a modulo rational 
-    int n.
+    int n.  The order divides the Carmichael function lambda(n),
+    found from the factorization of n, so we start from lambda(n)
+    and remove prime factors q while a**(t/q) is still 1 mod n.
+    This takes O(log n) modular powers once n is factored.
     """
 
-    prod = a % n
-    for count in range (1, n):
-        if prod == 1:
-            return count
+    return ord_modulo_batch ([a], n)[0]
+
+####----- end function -----
+
+
+def ord_modulo_batch (bases, n):
+    """ Orders of each of the ints in bases modulo n.
+
+    As ord_modulo, but lambda(n) and its prime factors are found
+    only once for all the bases.
+    """
+
+    if n == 0:
+        raise ZeroDivisionError
+    if n <= 1:
+        return ["Not relatively prime to n" for a in bases]
+    lam = carmichael (n)
+    lam_primes = [q for q, expo in factor (lam)]
+    orders = []
+    for a in bases:
+        if euclid_alg (a, n) != 1:
+            orders.append ("Not relatively prime to n")
+            continue
+        t = lam
+        for q in lam_primes:
+            while t % q == 0 and pow (a, t // q, n) == 1:
+                t = t // q
+        orders.append (t)
+
+    return orders
+
+####----- end function -----
+
+
+def carmichael (n):
+    """ Carmichael function lambda(n).
+
+    The exponent of the unit group mod n: the lcm over p**e || n
+    of phi(p**e), except that lambda(2**e) = 2**(e-2) for e >= 3.
+    """
+
+    lam = 1
+    for p, expo in factor (n):
+        if p == 2 and expo >= 3:
+            lam_pe = 2**(expo - 2)
         else:
-            prod = (a * prod) % n
-            
-    return   "Not relatively prime to n"
+            lam_pe = p**(expo - 1) * (p - 1)
+        lam = lam // euclid_alg (lam, lam_pe) * lam_pe
+
+    return lam
 
 ####----- end function -----
 
@@ -30,16 +81,145 @@ def solve_quad_mod (a, b, c, n):
 
     Find all solutions to the quadratic equation  
         a*x^2 + b*x + c  = 0 mod n
-    for integer n.  Here a, b, c are integers.
+    for integer n.  Here a, b, c are integers.  We factor n,
+    solve modulo each prime p dividing n, lift the roots to the
+    exact power p**e with Hensel's lemma, and combine the prime
+    powers with the Chinese remainder theorem.  Apart from the
+    factoring the cost depends on log n and on the number of
+    solutions, not on n.  The list returned is sorted.
+    """
+
+    if n <= 0:
+        return []
+    moduli = []
+    root_lists = []
+    for p, expo in factor (n):
+        roots = quad_roots_mod_prime_power (a, b, c, p, expo)
+        if not roots:
+            return []
+        moduli.append (p**expo)
+        root_lists.append (roots)
+
+    return sorted (crt_combine (root_lists, moduli))
+
+####----- end function -----
+
+
+def sqrt_mod_prime (a, p):
+    """ A square root of a modulo the odd prime p.
+
+    Tonelli-Shanks.  Returns r with r*r = a mod p and 0 <= r < p,
+    or None if a is not a square mod p.
+    """
+
+    a = a % p
+    if a == 0:
+        return 0
+    if pow (a, (p - 1) // 2, p) != 1:
+        return None
+    if p % 4 == 3:
+        return pow (a, (p + 1) // 4, p)
+                                        # p - 1 = q * 2**s, q odd
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q, s = q // 2, s + 1
+                                        # z any non-residue
+    z = 2
+    while pow (z, (p - 1) // 2, p) != p - 1:
+        z = z + 1
+    m, c = s, pow (z, q, p)
+    t, r = pow (a, q, p), pow (a, (q + 1) // 2, p)
+    while t != 1:
+                                        # least i with t**(2**i) = 1
+        i, t2 = 0, t
+        while t2 != 1:
+            t2, i = t2 * t2 % p, i + 1
+        bb = pow (c, 1 << (m - i - 1), p)
+        m, c = i, bb * bb % p
+        t, r = t * c % p, r * bb % p
+
+    return r
+
+####----- end function -----
+
+
+def quad_roots_mod_prime (a, b, c, p):
+    """ Sorted roots of a*x^2 + b*x + c modulo the prime p.
+
+    Tries every residue for small p.  Otherwise a linear equation
+    is solved directly, and a quadratic by completing the square
+    with sqrt_mod_prime.
+    """
+
+    a, b, c = a % p, b % p, c % p
+    if p < 64:
+        return [x for x in range (p) if (a*x*x + b*x + c) % p == 0]
+    if a == 0:
+        if b == 0:
+            if c == 0:
+                return list (range (p))
+            return []
+        return [(-c * pow (b, -1, p)) % p]
+    s = sqrt_mod_prime (b*b - 4*a*c, p)
+    if s is None:
+        return []
+    inv_2a = pow (2*a, -1, p)
+
+    return sorted (set ([(-b + s) * inv_2a % p, (-b - s) * inv_2a % p]))
+
+####----- end function -----
+
+
+def quad_roots_mod_prime_power (a, b, c, p, expo):
+    """ Roots of a*x^2 + b*x + c modulo p**expo, p prime.
+
+    Roots mod p are lifted one power at a time.  With
+    f(x) = a*x^2 + b*x + c and f(r) = 0 mod p**k, k >= 1,
+        f(r + t*p**k) = f(r) + t*p**k*f'(r)  mod p**(k+1) ,
+    so if p does not divide f'(r) there is exactly one t mod p,
+    and otherwise every t works if p**(k+1) divides f(r) and
+    none does if not.
     """
 
-    solutions = []
-    for x in range (n):
-        poly_val = (a*x*x + b*x + c) % n
-        if poly_val == 0:
-            solutions.append(x)
+    roots = quad_roots_mod_prime (a, b, c, p)
+    pk = p
+    for k in range (1, expo):
+        lifted = []
+        for r in roots:
+            f_r = a*r*r + b*r + c
+            df_r = (2*a*r + b) % p
+            if df_r != 0:
+                t = (-(f_r // pk) * pow (df_r, -1, p)) % p
+                lifted.append (r + t * pk)
+            elif f_r % (pk * p) == 0:
+                lifted.extend ([r + t * pk for t in range (p)])
+        roots = lifted
+        pk = pk * p
+
+    return roots
 
-    return   solutions
+####----- end function -----
+
+
+def crt_combine (residue_lists, moduli):
+    """ Chinese remainder theorem over sets of residues.
+
+    moduli are pairwise coprime, and residue_lists[i] holds
+    residues mod moduli[i].  Returns all x mod the product of
+    the moduli whose reduction mod each moduli[i] is in
+    residue_lists[i].
+    """
+
+    sols, modulus = [0], 1
+    for residues, m in zip (residue_lists, moduli):
+                                        # x = s + modulus * u, with
+                                        # u = (r - s) / modulus mod m
+        inv = pow (modulus, -1, m)
+        sols = [s + modulus * ((r - s) * inv % m) \
+                    for s in sols for r in residues]
+        modulus = modulus * m
+
+    return sols
 
 ####----- end function -----
 
@@ -49,72 +229,282 @@ def solve2_quad_mod (a, b, c, d, n):
 
     Find all solutions to the quadratic equation  
         a*x^2 + b*x*y + c*y^2 + d  = 0 mod n
-    for integer n.  Here a, b, c, d are integers.
+    for integer n.  Here a, b, c, d are integers.  Returns
+    (nSols, solutions), the pairs (x, y) in increasing order.
+    For each x the y values come from solve_quad_mod, so the
+    work is about n steps rather than n^2.  Use
+    solve2_quad_mod_count when only the number is wanted.
+    """
+
+    solutions = list (solve2_quad_mod_iter (a, b, c, d, n))
+
+    return   (len (solutions), solutions)
+
+####----- end function -----
+
+
+def solve2_quad_mod_iter (a, b, c, d, n):
+    """ Generator of the solutions of a*x^2 + b*x*y + c*y^2 + d = 0 mod n.
+
+    Yields the same pairs (x, y), in the same order, as
+    solve2_quad_mod, without building the list.
+    """
+
+    for x in range (max (n, 0)):
+        for y in solve_quad_mod (c, b*x, a*x*x + d, n):
+            yield (x, y)
+
+####----- end function -----
+
+
+def solve2_quad_mod_count (a, b, c, d, n):
+    """ Number of solutions of a*x^2 + b*x*y + c*y^2 + d = 0 mod n.
+
+    The count is multiplicative over the prime powers p**e
+    exactly dividing n.  Write Q(x, y) = a*x^2 + b*x*y + c*y^2
+    with discriminant disc = b^2 - 4ac.  For odd p not dividing
+    disc the solutions with (x, y) != (0, 0) mod p are
+    nonsingular and each lifts to p**(e-1) solutions mod p**e.
+    Mod p the number of them is p - (disc/p) for Q = t != 0,
+    and (p - 1)(1 + (disc/p)) for Q = 0.  Solutions with
+    p | x, y reduce to t / p**2 mod p**(e-2).  Other p (2, or
+    dividing disc) are counted the same way after a change of
+    variables, see _count_q_prime_power, so the work is about
+    log n steps per prime.
+    """
+
+    if n <= 0:
+        return 0
+    disc = b*b - 4*a*c
+    count = 1
+    for p, expo in factor (n):
+        if p != 2 and disc % p != 0:
+            count = count * _count_q_nondegenerate (disc, -d, p, expo)
+        else:
+            count = count * _count_q_prime_power (a, b, c, -d, p, expo)
+
+    return count
+
+####----- end function -----
+
+
+def _count_q_nondegenerate (disc, t, p, expo):
+    """ Number of (x, y) mod p**expo with Q(x, y) = t, p odd, p not | disc. """
+
+    if expo <= 0:
+        return 1
+    pe = p**expo
+    t = t % pe
+    chi = legendre (disc, p)
+                                        # (x, y) != (0, 0) mod p
+    if t % p != 0:
+        count = p - chi
+    else:
+        count = (p - 1) * (1 + chi)
+    count = count * p**(expo - 1)
+                                        # x = y = 0 mod p
+    if expo == 1:
+        if t == 0:
+            count = count + 1
+    elif t % (p*p) == 0:
+        count = count + p*p * _count_q_nondegenerate (disc, t // (p*p), \
+                                                    p, expo - 2)
+
+    return count
+
+####----- end function -----
+
+
+def _valuation (n, p, cap):
+    """ Exponent of p in n, at most cap; cap for n = 0. """
+
+    v = 0
+    while v < cap and n % p == 0:
+        n = n // p
+        v = v + 1
+
+    return v
+
+####----- end function -----
+
+
+def _count_q_prime_power (a, b, c, t, p, expo):
+    """ Number of (x, y) mod p**expo with Q(x, y) = t, any prime p.
+
+    A common factor p**g of a, b, c is divided out of Q and t.
+    For odd p the primitive Q is made diagonal by completing
+    the square, 4aQ = (2ax + by)^2 - disc*y^2, once a is a
+    unit mod p.  For p = 2 with b odd the solutions mod 2 other
+    than (0, 0) are nonsingular and lift as for odd p;  with b
+    even, a*Q = (ax + (b/2)y)^2 + (ac - b^2/4)y^2 for a odd.
     """
 
-    solutions = []
-    nSols = 0
-    for x in range (n):
-        for y in range (n):
-            poly_val = (a*x*x + b*x*y + c*y*y + d) % n
-            if poly_val == 0:
-                solutions.append((x, y))
-                nSols = nSols + 1
+    if expo <= 0:
+        return 1
+    pe = p**expo
+    a, b, c, t = a % pe, b % pe, c % pe, t % pe
+    g = min (_valuation (a, p, expo), _valuation (b, p, expo), \
+                _valuation (c, p, expo))
+    if g == expo:
+        return pe*pe if t == 0 else 0
+    if g > 0:
+        pg = p**g
+        if t % pg != 0:
+            return 0
+        return pg*pg * _count_q_prime_power (a // pg, b // pg, c // pg, \
+                                            t // pg, p, expo - g)
+    if p != 2:
+        if a % p == 0:
+            if c % p != 0:
+                a, c = c, a
+            else:
+                                        # x -> x, y -> x + y
+                a, b = a + b + c, b + 2*c
+        return _count_diagonal (1, 4*a*c - b*b, 4*a*t, p, expo)
+    if b % 2 == 0:
+        if a % 2 == 0:
+            a, c = c, a
+        return _count_diagonal (1, a*c - (b//2)**2, a*t, p, expo)
+                                        # (x, y) != (0, 0) mod 2
+    count = sum ([1 for x, y in [(0, 1), (1, 0), (1, 1)] \
+                    if (a*x*x + b*x*y + c*y*y - t) % 2 == 0])
+    count = count * 2**(expo - 1)
+                                        # x = y = 0 mod 2
+    if expo == 1:
+        if t == 0:
+            count = count + 1
+    elif t % 4 == 0:
+        count = count + 4 * _count_q_prime_power (a, b, c, t // 4, 2, \
+                                                expo - 2)
+
+    return count
+
+####----- end function -----
+
 
-    return   (nSols, solutions)
+def _count_diagonal (alpha, beta, t, p, expo):
+    """ Number of (x, y) mod p**expo with alpha*x^2 + beta*y^2 = t.
+
+    Once alpha is a unit, the solutions with x a unit are
+    nonsingular for odd p and lift by p**(e-1).  For p = 2 the
+    gradient is even, but the solutions with x odd (or, for beta
+    odd, any (x, y) != (0, 0) mod 2) still double from one power
+    of 2 to the next past 2**3, so they are counted mod 8.  The
+    rest have p | x, and x = p*x' leaves the form
+    p*alpha*x'^2 + (beta/p)*y^2 = t/p mod p**(e-1), or for
+    p = 2 with beta odd, p | y too and t/4 mod 2**(e-2).
+    """
+
+    if expo <= 0:
+        return 1
+    pe = p**expo
+    alpha, beta, t = alpha % pe, beta % pe, t % pe
+    g = min (_valuation (alpha, p, expo), _valuation (beta, p, expo))
+    if g == expo:
+        return pe*pe if t == 0 else 0
+    if g > 0:
+        pg = p**g
+        if t % pg != 0:
+            return 0
+        return pg*pg * _count_diagonal (alpha // pg, beta // pg, t // pg, \
+                                        p, expo - g)
+    if alpha % p == 0:
+        alpha, beta = beta, alpha
+    if p != 2:
+        if beta % p != 0:
+            return _count_q_nondegenerate (-4*alpha*beta, t, p, expo)
+        if t % p != 0:
+            return pe * (1 + legendre (alpha*t, p))
+        return p * _count_diagonal (p*alpha, beta // p, t // p, p, expo - 1)
+    if expo <= 3:
+        return sum ([1 for x in range (pe) for y in range (pe) \
+                        if (alpha*x*x + beta*y*y - t) % pe == 0])
+    if beta % 2 != 0:
+        count = sum ([1 for x in range (8) for y in range (8) \
+                        if (x % 2 or y % 2) \
+                        and (alpha*x*x + beta*y*y - t) % 8 == 0])
+        count = count * 2**(expo - 3)
+        if t % 4 == 0:
+            count = count + 4 * _count_diagonal (alpha, beta, t // 4, 2, \
+                                                expo - 2)
+        return count
+    count = sum ([1 for x in range (1, 8, 2) for y in range (8) \
+                    if (alpha*x*x + beta*y*y - t) % 8 == 0])
+    count = count * 2**(expo - 3)
+    if t % 2 == 0:
+        count = count + 2 * _count_diagonal (2*alpha, beta // 2, t // 2, 2, \
+                                            expo - 1)
+
+    return count
 
 ####----- end function -----
 
 
-def euclid_alg (a, b):
+def legendre (a, p):
+    """ Legendre symbol (a/p) for an odd prime p, by Euler's criterion. """
+
+    a = a % p
+    if a == 0:
+        return 0
+    if pow (a, (p - 1) // 2, p) == 1:
+        return 1
+    return -1
+
+####----- end function -----
+
+
+def euclid_alg (a, b, backend=None):
     """ Euclidean algorithm for gcd.
 
         Finds the greatest common divisor of
-        two integers.
+        two integers.  The work is done by the big integer
+        backend (see nt_backend), the current one by default.
     """
 
-    a, b = abs(a), abs(b)
-    while  b != 0:
-        r = a % b
-        a, b = b, r
-
-    return a
+    return get_backend (backend).gcd (a, b)
 
 ####----- end function -----
 
 
-def ext_euclid_alg (m, n):
+def ext_euclid_alg (m, n, backend=None):
     """ Extended Euclidean algorithm for gcd.
 
     Finds the greatest common divisor of
     two integers a and bm and solves for integer
     x, y such that ax + by = 1.  From Knuth, TAOCP
-    vol. I, p. 14.
-    Variables --
-        q, r -- quotient and remainder
-        a, b -- am + bn = gcd
-        apme, bpme -- a prime and b prime
-        t -- temporary
+    vol. I, p. 14.  Returns (gcd, x, y), from the big
+    integer backend (see nt_backend); every backend gives
+    the same x, y.
     """
 
-    m, n = abs(m), abs(n)
-    q, r = m // n, m % n
-    apme = b = 1
-    a = bpme = 0
+    return get_backend (backend).ext_gcd (m, n)
 
-    while  r != 0:
-        m, n = n, r 
-        t = apme
-        apme = a
-        a = t - q * a
-        t = bpme
-        bpme = b
-        b = t - q * b
-        """ reset q and r """
-        q, r = m // n, m % n
 
-    return (n, a, b)
+####----- end function -----
+
+
+def is_square (n, backend=None):
+    """ Perfect square test.
+
+    True if the integer n is the square of an integer.
+    """
 
+    return get_backend (backend).is_square (n)
+
+####----- end function -----
+
+
+def factor (n):
+    """ Prime factorization of integer n.
+
+    Returns a list of pairs [p, e], p prime and increasing, with
+    |n| the product of the p**e.  For |n| <= 1 the list is
+    empty.  The work is done by factorize.factor_int, trial
+    division then Pollard-Brent, and results are kept in its
+    shared LRU cache.
+    """
+
+    return [[p, expo] for p, expo in factorize.factor_int (n)]
 
 ####----- end function -----
 
@@ -123,16 +513,10 @@ def sigma (n):
     """ Sum of divisors of integer n.
 
     Computes the sum of the positive divisors of the
-    integer n.
+    integer n, from its factorization.
     """
 
-    n = abs (n)
-    sum = n
-    for d in range (1, 1 + (n // 2)):
-        if n % d == 0:
-            sum = sum + d
-
-    return sum
+    return sigma_k (n, 1)
 
 ####----- end function -----
 
@@ -140,14 +524,20 @@ def sigma_k (n, k):
     """ Sum of divisors of integer n to the power k.
 
     Computes the sum of the positive divisors of the
-    integer n raised to the power k.
+    integer n raised to the power k.  This is multiplicative,
+    with sigma_k(p**e) = 1 + p**k + ... + p**(e*k).
     """
 
     n = abs (n)
-    sum = n**k
-    for d in range (1, 1 + (n // 2)):
-        if n % d == 0:
-            sum = sum + d**k
+    if n == 0:
+        return 0**k
+    sum = 1
+    for p, expo in factor (n):
+        pk = p**k
+        term = 1
+        for i in range (expo):
+            term = term * pk + 1
+        sum = sum * term
 
     return sum
 
@@ -157,17 +547,16 @@ def sigma_k (n, k):
 def phi (n):
     """ Euler phi function.
 
-    A simplistic approach to the Euler totient phi function.
-    We simply count the number of relatively prime integers between
-    1 and n.
+    Computed from the prime decomposition of n, as
+    n * (1 - 1/p) over the primes p dividing n.
     """
 
     n = abs (n)
-    sum = 0
-                                        # the list [1, ..., n]
-    for d in range (1, 1 + n):
-        if euclid_alg (n,d) == 1:
-            sum = sum + 1
+    if n == 0:
+        return 0
+    sum = n
+    for p, expo in factor (n):
+        sum = sum // p * (p - 1)
 
     return sum
 
@@ -178,92 +567,228 @@ def phi2 (n, p=2):
 
     We use the fact that phi has a formula in terms of the prime
     decomposition of n.  We assume n is a positive integer.  The
-    default initial value for prime p is 2.  Thus calls such as
-    phi2 (52961) will succeed, though given n is odd we could also
-    use phi2 (52961, 3).
-    Variables --
-                nextp -- the next prime dividing n
-                expo -- exponent of nextp exactly dividing n
+    argument p, once the first prime to try, is kept so that
+    calls such as phi2 (52961, 3) still work; it is not needed.
     """
-                                        # stopping condition
-    if n == 1:
-        return 1
-    
-                                        # search for next prime dividing n
-    nextp = p
-    while (n % nextp != 0):
-        nextp = nextp + 1
-                                        # find exact power of prime in n
-    expo = 0
-    while (n % nextp == 0):
-        n, expo = n // nextp, expo + 1
 
+    sum = 1
+    for nextp, expo in factor (n):
                                         # formula for phi(p**e)
-    factor = nextp**expo - nextp**(expo - 1)
-    return factor * phi2 (n, nextp)
+        sum = sum * (nextp**expo - nextp**(expo - 1))
+    return sum
     
             
 ####----- end function -----
 
- 
+
+def prime_sieve (N):
+    """ Sieve of Eratosthenes.
+
+    Returns a bytearray of length N + 1 with a 1 exactly at the
+    prime indices.
+    """
+
+    is_prime = bytearray ([1]) * (N + 1)
+    is_prime[0:2] = bytearray (min (2, N + 1))
+    p = 2
+    while p * p <= N:
+        if is_prime[p]:
+            is_prime[p*p::p] = bytearray (len (range (p*p, N + 1, p)))
+        p = p + 1
+    return is_prime
+
+####----- end function -----
+
+
+def spf_sieve (N):
+    """ Smallest prime factor of each integer 0 .. N.
+
+    Returns an array of signed 64 bit ints, spf[n] the least
+    prime dividing n for n >= 2, and spf[0] = 0, spf[1] = 1.
+    Larger primes are sieved first so that smaller ones
+    overwrite them.
+    """
+
+    spf = array ('q', range (N + 1))
+    is_prime = prime_sieve (N)
+    for p in range (get_backend ().isqrt (N), 1, -1):
+        if is_prime[p]:
+            spf[p*p::p] = array ('q', [p]) * len (range (p*p, N + 1, p))
+    return spf
+
+####----- end function -----
+
+
+def phi_range (N):
+    """ Euler phi of every integer 0 .. N.
+
+    Returns an array of signed 64 bit ints with phi[n] = phi(n),
+    and phi[0] = 0.  Each prime p takes a factor (1 - 1/p) off
+    its multiples, as in the sieve of Eratosthenes.
+    """
+
+    phi = array ('q', range (N + 1))
+    is_prime = prime_sieve (N)
+    for p in range (2, N + 1):
+        if is_prime[p]:
+            phi[p::p] = array ('q', [v - v // p for v in phi[p::p]])
+    return phi
+
+####----- end function -----
+
+
+def sigma_k_range (N, k):
+    """ sigma_k of every integer 0 .. N.
+
+    Returns sig with sig[n] = sigma_k(n) and sig[0] = 0, an array
+    of signed 64 bit ints when the values fit and a list of ints
+    otherwise.  Built in one pass over the smallest prime factor
+    sieve: if p = spf[n] and p**e exactly divides n then
+        sigma_k(n) = sigma_k(n / p**e) * (1 + p**k + ... + p**(e*k)) ,
+    where the second factor, ppart[n], and rest[n] = n / p**e are
+    found from those of n / p.
+    """
+
+    spf = spf_sieve (N)
+                                        # sigma_k(n) < 32 n**k here
+    if k == 0 or (N**k) << 6 < 2**63:
+        sig = array ('q', bytes (8 * (N + 1)))
+        ppart = array ('q', sig)
+    else:
+        sig = [0] * (N + 1)
+        ppart = [0] * (N + 1)
+    rest = array ('q', bytes (8 * (N + 1)))
+    if N >= 1:
+        sig[1] = 1
+    for n in range (2, N + 1):
+        p = spf[n]
+        m = n // p
+        if spf[m] == p:
+            ppart[n] = ppart[m] * p**k + 1
+            rest[n] = rest[m]
+        else:
+            ppart[n] = p**k + 1
+            rest[n] = m
+        sig[n] = sig[rest[n]] * ppart[n]
+    return sig
+
+####----- end function -----
+
+
+def sigma_range (N):
+    """ Sum of divisors of every integer 0 .. N, see sigma_k_range. """
+
+    return sigma_k_range (N, 1)
+
+####----- end function -----
+
+
+
 def lst_bqform_diag_rpns (n, a, b):
     """ List of representations of n by binary quad forms.
 
     Here we deal only with the diagonal case a*x**2 + b*y**2 = n. 
     Also, we limit a and b to be > 0, and we are looking only
-    for nonnegative solutions.
-    Variables --
-                nextp -- the next prime dividing n
+    for nonnegative solutions, returned as [x, y] in increasing
+    order.  A solution with gcd(x, y) = g is g times a primitive
+    solution for n / g**2, so we find primitive solutions for
+    each square divisor g**2 of n with bqform_diag_primitive.
     """
 
-                                        # bounds for a and b with a
-                                        # little extra room
-    a_bnd  =  int((1 + n / a)**0.5)
-    b_bnd  =  int((1 + n / a)**0.5)
-                                        # initialize list
-    lst_rpns = []
-                                        # loops
-    for x in range (a_bnd + 1):
-        for y in range (b_bnd + 1):
-            if n == a*x*x + b*y*y:
-                lst_rpns.append([x, y])
-
-    return lst_rpns
+    if n < 0:
+        return []
+    if n == 0:
+        return [[0, 0]]
+    sq_divs = [1]
+    for p, expo in factor (n):
+        sq_divs = [g * p**i for g in sq_divs for i in range (expo // 2 + 1)]
+    rpns = set ()
+    for g in sq_divs:
+        for x, y in bqform_diag_primitive (n // (g*g), a, b):
+            rpns.add ((g*x, g*y))
+
+    return [[x, y] for x, y in sorted (rpns)]
     
             
 ####----- end function -----
 
+
+def bqform_diag_primitive (m, a, b):
+    """ Nonnegative solutions of a*x**2 + b*y**2 = m with gcd(x, y) = 1.
+
+    Cornacchia's method, for a, b, m > 0.  If gcd(a, m) = 1 then
+    y is prime to m in a primitive solution, so x = t*y mod m for
+    a root t of a*t^2 + b = 0 mod m.  Such (x, y) form a lattice
+    on which Q = a*x^2 + b*y^2 takes only multiples of m, so a
+    solution is a shortest vector, found by Lagrange reduction
+    of the basis (m, 0), (t, 1) under Q.  If instead gcd(b, m) = 1
+    the roles of x and y swap.  A common factor g of a and b is
+    first divided out of the equation, none if g does not divide
+    m.  When both gcds still exceed 1, a prime p dividing a and m
+    divides b*y^2 but not b, so p | y, and y = p*y' leaves
+    (a/p)*x^2 + (b*p)*y'^2 = m/p.  May also return some solutions
+    that are not primitive.
+    """
+
+    g = euclid_alg (a, b)
+    if g != 1:
+        if m % g != 0:
+            return []
+        return bqform_diag_primitive (m // g, a // g, b // g)
+    if euclid_alg (a, m) != 1:
+        if euclid_alg (b, m) == 1:
+            return [(x, y) for y, x in bqform_diag_primitive (m, b, a)]
+        p = factor (euclid_alg (a, m))[0][0]
+        return [(x, p*y) for x, y in bqform_diag_primitive (m // p, \
+                                                        a // p, b*p)]
+
+    def q_form (v):
+        return a*v[0]*v[0] + b*v[1]*v[1]
+
+    sols = set ()
+    for t in solve_quad_mod (a, 0, b, m):
+        u, v = (m, 0), (t, 1)
+                                        # Lagrange (Gauss) reduction
+        while 1:
+            if q_form (v) < q_form (u):
+                u, v = v, u
+            q_u = q_form (u)
+            b_uv = a*u[0]*v[0] + b*u[1]*v[1]
+                                        # nearest integer to b_uv / q_u
+            mu = (2*b_uv + q_u) // (2*q_u)
+            if mu == 0:
+                break
+            v = (v[0] - mu*u[0], v[1] - mu*u[1])
+                                        # shortest vectors of a reduced
+                                        # basis are among these
+        for w in (u, v, (u[0] + v[0], u[1] + v[1]), \
+                        (u[0] - v[0], u[1] - v[1])):
+            if q_form (w) == m:
+                sols.add ((abs (w[0]), abs (w[1])))
+
+    return sorted (sols)
+
+####----- end function -----
+
  
 def square_part (n):
     """ Returns factorization of n as a square times square-free part.
 
     Returns a list [nsq, nsq_free] so that 
                     n = nsq_free * nsq**2.
-    Variables --
-                nextp -- the next prime dividing n
+    Built from the cached factorization of n, see factor.
     """
 
+    if n == 0:
+        return [1, 0]
     sgn_n = 1
     if n < 0:
         sgn_n = -1
-    n = abs(n)
     nsq, nsq_free = 1, 1
-                                        # next prime
-    nextp = 2
-                                        # loops
-    while n != 1:
-                                        # nextp does not divide n
-        if n % nextp != 0:
-            nextp += 1
-                                        # nextp**2 divides n
-        elif n % (nextp * nextp) == 0:
-            nsq = nsq * nextp
-            n = n // (nextp * nextp)
-                                        # nextp || n
-        else:
-            n = n // nextp
-            nsq_free = nsq_free * nextp     
-
+    for p, expo in factor (n):
+        nsq = nsq * p**(expo // 2)
+        if expo % 2 == 1:
+            nsq_free = nsq_free * p
 
     return [nsq, sgn_n * nsq_free]
     
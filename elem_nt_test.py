@@ -7,6 +7,8 @@
 
 import unittest
 from elem_nt import *
+import factorize
+from nt_backend import BACKENDS, get_backend, set_backend
 
 
 
@@ -35,6 +37,21 @@ class Elem_NT_Tests (unittest.TestCase):
 		self.failUnless (ans == 48)
 		ans = ord_modulo(7, 97)
 		self.failUnless (ans == 96)
+		ans = ord_modulo(6, 98)
+		self.failUnless (ans == "Not relatively prime to n")
+		ans = ord_modulo(2, 2**61 - 1)
+		self.failUnless (ans == 61)
+		ans = ord_modulo_batch([2, 3, 4, 6], 10**12 + 39)
+		self.failUnless (ans == [500000000019, 1000000000038, \
+								500000000019, 1000000000038])
+
+	def testCarmichael (self):
+		ans = carmichael(561)
+		self.failUnless (ans == 80)
+		ans = carmichael(2**10)
+		self.failUnless (ans == 2**8)
+		ans = carmichael(2 * 9 * 7)
+		self.failUnless (ans == 6)
 
 	def testEuclid_Alg (self):
 		ans = euclid_alg(112, 211)
@@ -44,6 +61,30 @@ class Elem_NT_Tests (unittest.TestCase):
 		ans = euclid_alg(502, 52961)
 		self.failUnless (ans == 251)
 
+	def testExt_Euclid_Alg (self):
+		ans = ext_euclid_alg(240, 46)
+		self.failUnless (ans == (2, -9, 47))
+		for name in BACKENDS:
+			ans = ext_euclid_alg(502, 52961, backend=name)
+			self.failUnless (ans == (251, -105, 1))
+			ans = ext_euclid_alg(-240, 46, backend=name)
+			self.failUnless (ans == (2, -9, 47))
+			ans = euclid_alg(-33, 96, backend=name)
+			self.failUnless (ans == 3)
+
+	def testBackends (self):
+		n = 3**2001
+		for name in BACKENDS:
+			self.failUnless (is_square(n * n, backend=name))
+			self.failIf (is_square(n * n - 1, backend=name))
+			self.failUnless (get_backend(name).isqrt(n * n + n) == n)
+		self.assertRaises (ValueError, get_backend, 'no_such_backend')
+		old = get_backend ()
+		set_backend ('python')
+		self.failUnless (get_backend().name == 'python')
+		self.failUnless (euclid_alg(502, 52961) == 251)
+		set_backend (old.name)
+
 	def testSigma (self):
 		ans = sigma(6)
 		self.failUnless (ans == 12)
@@ -58,6 +99,56 @@ class Elem_NT_Tests (unittest.TestCase):
 		ans = sigma(101)
 		self.failUnless (ans == 102)
 
+	def testSigma_K (self):
+		ans = sigma_k(12, 0)
+		self.failUnless (ans == 6)
+		ans = sigma_k(12, 2)
+		self.failUnless (ans == 210)
+		ans = sigma_k(2**31 - 1, 1)
+		self.failUnless (ans == 2**31)
+
+	def testFactor (self):
+		ans = factor(52961)
+		self.failUnless (ans == [[211, 1], [251, 1]])
+		ans = factor(-720)
+		self.failUnless (ans == [[2, 4], [3, 2], [5, 1]])
+		ans = factor(1)
+		self.failUnless (ans == [])
+		ans = factor(2**64 + 1)
+		self.failUnless (ans == [[274177, 1], [67280421310721, 1]])
+		ans = factor(7 * (10**12 + 39)**2)
+		self.failUnless (ans == [[7, 1], [1000000000039, 2]])
+		self.failUnless (factorize.is_prime(2**89 - 1))
+		self.failIf (factorize.is_prime(3215031751))
+		ans = sigma_k(2**61 - 1, 1)
+		self.failUnless (ans == 2**61)
+
+	def testSquare_Part (self):
+		ans = square_part(720)
+		self.failUnless (ans == [12, 5])
+		ans = square_part(-52961)
+		self.failUnless (ans == [1, -52961])
+		ans = square_part(3 * (2**61 - 1)**2)
+		self.failUnless (ans == [2**61 - 1, 3])
+
+	def testPhiRange (self):
+		ans = phi_range(12)
+		self.failUnless (list(ans) == [0,1,1,2,2,4,2,6,4,6,4,10,4])
+		ans = phi_range(1000)
+		for n in range (1, 1001):
+			self.failUnless (ans[n] == phi(n))
+
+	def testSigmaKRange (self):
+		ans = sigma_range(12)
+		self.failUnless (list(ans) == [0,1,3,4,7,6,12,8,15,13,18,12,28])
+		ans = sigma_k_range(12, 0)
+		self.failUnless (list(ans) == [0,1,2,2,3,2,4,2,4,3,4,2,6])
+		ans = sigma_k_range(1000, 2)
+		for n in range (1, 1001):
+			self.failUnless (ans[n] == sigma_k(n, 2))
+		ans = spf_sieve(12)
+		self.failUnless (list(ans) == [0,1,2,3,2,5,2,7,2,3,2,11,2])
+
 	def testSolve_Quad_Mod (self):
 		ans = solve_quad_mod(1, 0, 1, 4)
 		self.failUnless (ans == [])
@@ -71,6 +162,59 @@ class Elem_NT_Tests (unittest.TestCase):
 		self.failUnless (ans == [4, 13])
 		ans = solve_quad_mod(1, 0, 1, 97)
 		self.failUnless (ans == [22, 75])
+		ans = solve_quad_mod(2, 3, 1, 1)
+		self.failUnless (ans == [0])
+		ans = solve_quad_mod(0, 0, 0, 6)
+		self.failUnless (ans == [0, 1, 2, 3, 4, 5])
+		ans = solve_quad_mod(1, 0, 0, 67**2)
+		self.failUnless (ans == [67 * t for t in range (67)])
+		n = (10**9 + 7) * 998244353 * 8
+		ans = solve_quad_mod(1, 0, -1, n)
+		self.failUnless (len(ans) == 16)
+		for x in ans:
+			self.failUnless ((x*x - 1) % n == 0)
+		n = (2**61 - 1) * (10**12 + 39)
+		ans = solve_quad_mod(1, 1, 1, n)
+		self.failUnless (ans[0] == 920046306058316283864871794861)
+		self.failUnless (len(ans) == 4)
+
+	def testSolve2_Quad_Mod (self):
+		ans = solve2_quad_mod(1, 0, 1, -1, 5)
+		self.failUnless (ans == (4, [(0, 1), (0, 4), (1, 0), (4, 0)]))
+		ans = solve2_quad_mod(1, 1, 1, 0, 3)
+		self.failUnless (ans == (3, [(0, 0), (1, 1), (2, 2)]))
+		ans = solve2_quad_mod_iter(1, 0, 1, -1, 10**12)
+		self.failUnless (next (ans) == (0, 1))
+		for n in range (1, 40):
+			ans = solve2_quad_mod(2, 1, -3, 5, n)
+			self.failUnless (solve2_quad_mod_count(2, 1, -3, 5, n) == ans[0])
+			ans = solve2_quad_mod(1, 0, 1, 0, n)
+			self.failUnless (solve2_quad_mod_count(1, 0, 1, 0, n) == ans[0])
+		p = 2**61 - 1
+		ans = solve2_quad_mod_count(1, 0, 1, -1, p)
+		self.failUnless (ans == p - legendre(-4, p))
+										# p = 2 and p dividing disc
+		for args in [(1, 0, 1, -1), (1, 0, -94, -1), (2, 2, 4, -8), \
+					(4, 4, 1, 0), (1, 3, 9, -9), (0, 0, 8, 0)]:
+			for n in [2**7, 3**5, 47**2, 2**4 * 3**3]:
+				ans = solve2_quad_mod(*(args + (n,)))
+				self.failUnless (solve2_quad_mod_count(*(args + (n,))) == ans[0])
+		self.failUnless (solve2_quad_mod_count(1, 0, 1, -1, 2**18) == 2**19)
+		self.failUnless (solve2_quad_mod_count(1, 0, 1, -1, 2**30) == 2**31)
+		ans = solve2_quad_mod_count(1, 0, -94, -1, 47**4)
+		self.failUnless (ans == 2 * 47**4)
+
+	def testSqrt_Mod_Prime (self):
+		p = 2**61 - 1
+		ans = sqrt_mod_prime(5, p)
+		self.failUnless (ans * ans % p == 5)
+		p = 7 * 2**20 + 1
+		for a in range (1, 50):
+			ans = sqrt_mod_prime(a, p)
+			if ans is None:
+				self.failUnless (pow (a, (p - 1) // 2, p) == p - 1)
+			else:
+				self.failUnless (ans * ans % p == a)
 
 	def testLst_Bqform_Diag_Rpns (self):
 		ans = lst_bqform_diag_rpns(3, 1, 1)
@@ -81,6 +225,31 @@ class Elem_NT_Tests (unittest.TestCase):
 		self.failUnless (ans == [[2, 5], [5, 2]])
 		ans = lst_bqform_diag_rpns(97, 1, 2)
 		self.failUnless (ans == [[5, 6]])
+		ans = lst_bqform_diag_rpns(0, 1, 1)
+		self.failUnless (ans == [[0, 0]])
+		ans = lst_bqform_diag_rpns(25, 1, 1)
+		self.failUnless (ans == [[0, 5], [3, 4], [4, 3], [5, 0]])
+		ans = lst_bqform_diag_rpns(9, 4, 1)
+		self.failUnless (ans == [[0, 3]])
+		ans = lst_bqform_diag_rpns(36, 2, 2)
+		self.failUnless (ans == [[3, 3]])
+		n = (10**9 + 7)**2 + 5 * (10**9 + 3)**2
+		ans = lst_bqform_diag_rpns(n, 1, 5)
+		self.failUnless ([10**9 + 7, 10**9 + 3] in ans)
+		self.failUnless (len(ans) == 24)
+		for x, y in ans:
+			self.failUnless (x*x + 5*y*y == n)
+										# a, b and m share factors
+		n = 2 * 10**14 + 2
+		ans = lst_bqform_diag_rpns(n, 2, 2)
+		self.failUnless (ans[:2] == [[1, 10**7], [440801, 9990280]])
+		self.failUnless (len(ans) == 16)
+		for x, y in ans:
+			self.failUnless (2*x*x + 2*y*y == n)
+		ans = lst_bqform_diag_rpns(6 * 10**12, 6, 10)
+		self.failUnless (len(ans) == 6)
+		self.failUnless (ans[-1] == [10**6, 0])
+		self.failUnless (lst_bqform_diag_rpns(10**15 + 1, 2, 2) == [])
 
 		
 def main():
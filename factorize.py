@@ -0,0 +1,174 @@
+#-------------------------------------------------------------
+# Module for integer factorization.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-------------------------------------------------------------
+
+
+from functools import lru_cache
+
+from nt_backend import get_backend
+
+
+                                        # trial division bound, and
+                                        # the primes below it
+TRIAL_BND = 1000
+SMALL_PRIMES = [p for p in range (2, TRIAL_BND) \
+                    if all (p % d for d in range (2, int (p**0.5) + 1))]
+
+                                        # Miller-Rabin with the primes
+                                        # to 41 as bases is exact below
+                                        # 3.3 * 10**24
+MR_BASES = SMALL_PRIMES[:13]
+MR_EXACT_BND = 3317044064679887385961981
+
+FACTOR_CACHE_SIZE = 4096
+
+
+
+def is_prime (n):
+    """ Primality test.
+
+    Trial division by the small primes, then Miller-Rabin to the
+    bases in MR_BASES.  This is a proof of primality for
+    n < MR_EXACT_BND; above that a composite passing all bases
+    is possible in principle but not known to occur.
+    """
+
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < TRIAL_BND * TRIAL_BND:
+        return True
+                                        # n - 1 = d * 2**s, d odd
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in MR_BASES:
+        x = pow (a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for i in range (s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+####----- end function -----
+
+
+def pollard_brent (n):
+    """ A nontrivial factor of the odd composite n.
+
+    Pollard's rho method with Brent's cycle finding, taking the
+    gcd of products of 128 differences at a time.  The map
+    x -> x**2 + c is tried for c = 1, 2, ... until a proper
+    factor turns up.
+    """
+
+    gcd = get_backend ().gcd
+    c = 0
+    while 1:
+        c = c + 1
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            x = y
+            for i in range (r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for i in range (min (128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs (x - y) % n
+                g = gcd (q, n)
+                k = k + 128
+            r = r * 2
+                                        # the batch overshot, so
+                                        # step through it one by one
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd (abs (x - ys), n)
+        if g != n:
+            return g
+
+####----- end function -----
+
+
+def _split (n, fctrs):
+    """ Add the prime factors of n > 1, no small ones, to the dict fctrs. """
+
+    if is_prime (n):
+        fctrs[n] = fctrs.get (n, 0) + 1
+        return
+    root = get_backend ().isqrt (n)
+    if root * root == n:
+        _split (root, fctrs)
+        _split (root, fctrs)
+        return
+    g = pollard_brent (n)
+    _split (g, fctrs)
+    _split (n // g, fctrs)
+
+####----- end function -----
+
+
+def _factor_int (n):
+    """ Prime factorization of |n| as a tuple of (p, e), p increasing.
+
+    Small primes come out by trial division, the rest by
+    Miller-Rabin and Pollard-Brent.  Empty for |n| <= 1.
+    """
+
+    n = abs (n)
+    fctrs = {}
+    for p in SMALL_PRIMES:
+        if p * p > n:
+            break
+        if n % p == 0:
+            expo = 0
+            while n % p == 0:
+                n, expo = n // p, expo + 1
+            fctrs[p] = expo
+    if n > 1:
+        _split (n, fctrs)
+    return tuple (sorted (fctrs.items ()))
+
+####----- end function -----
+
+
+                                        # shared LRU cache of results
+factor_int = lru_cache (maxsize=FACTOR_CACHE_SIZE) (_factor_int)
+
+
+
+def set_factor_cache_size (size):
+    """ Bound the factorization cache to size entries, clearing it.
+
+    size None means unbounded, 0 turns caching off.
+    """
+
+    global factor_int
+    factor_int = lru_cache (maxsize=size) (_factor_int)
+
+####----- end function -----
+
+
+def factor_cache_info ():
+    """ Hits, misses and size of the factorization cache. """
+
+    return factor_int.cache_info ()
+
+####----- end function -----
+
+
+def factor_cache_clear ():
+    factor_int.cache_clear ()
+
+####----- end function -----
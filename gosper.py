@@ -0,0 +1,246 @@
+#-------------------------------------------------------------------------------
+#  Module for Gosper's arithmetic on continued fraction streams.
+#
+#  Copyright 2026 Jesse I. Deutsch
+#
+#   $Id:$
+#
+#  The inputs are streams of partial quotients and so is the
+#  output.  An output term is emitted once the input terms read
+#  so far determine it, so only as much of each input is used
+#  as the output asked for needs.
+#-------------------------------------------------------------------------------
+
+
+from cntd_frac import cf_iter, cflist_iter
+from surd import Surd
+import linfractrans
+
+
+										# input terms read in a row
+										# without an output term, before
+										# giving up
+BUDGET = 1000
+
+
+
+def cf_terms (x):
+		""" Iterator over the partial quotients of x.
+
+		x is a Surd, a list in the format of cntd_frac, or any
+		iterable of partial quotients (finite or not).
+		"""
+
+		if isinstance (x, Surd):
+			return cf_iter (x)
+		if isinstance (x, list):
+			return cflist_iter (x)
+		return iter (x)
+
+
+####----- end function -----
+
+
+def _floor (n, d):
+		""" n // d, or None when d is 0. """
+
+		if d == 0:
+			return None
+		return n // d
+
+
+####----- end function -----
+
+
+def _rational_terms (p, q):
+		""" Partial quotients of p/q, nothing if q is 0. """
+
+		while q != 0:
+			cf_floor = p // q
+			yield cf_floor
+			p, q = q, p - cf_floor * q
+
+
+####----- end function -----
+
+
+def homographic (lft, x, budget=BUDGET):
+		""" Partial quotients of (a*x + b) / (c*x + d), lazily.
+
+		lft is a linfractrans.LFT (a, b, c, d); it is not changed.
+		After the first term of x is read, the rest of x lies in
+		[1, oo], so the value lies between a/c and (a+b)/(c+d).
+		If these have the same floor, and the denominators have
+		the same sign, that floor is the next output term and the
+		LFT becomes 1/(LFT - q).  Otherwise the next term t of x
+		is composed in as z -> t + 1/z.  At the end of a finite x
+		the value is a/c.  Raises ArithmeticError after budget
+		input terms in a row with no output.  That happens when
+		the rest of the value is an integer approached from both
+		sides, e.g. for a rational value of an irrational x.
+		"""
+
+		lft = linfractrans.LFT (lft.a, lft.b, lft.c, lft.d)
+		xs = cf_terms (x)
+		for term in xs:
+			lft.compose (linfractrans.LFT (term, 1, 1, 0))
+			break
+		else:
+			raise ValueError ("empty continued fraction")
+		return _homographic_tail (lft, xs, budget)
+
+
+####----- end function -----
+
+
+def _homographic_tail (lft, xs, budget):
+		""" homographic, with the first term of x already read.
+
+		xs is what is left of the stream, and lft is changed.
+		"""
+
+		read = 0
+		while (1):
+			q = _floor (lft.a, lft.c)
+			if q is not None and lft.c * (lft.c + lft.d) > 0 \
+					and q == _floor (lft.a + lft.b, lft.c + lft.d):
+				yield q
+				read = 0
+				lft.add_const (-q)
+				lft.reciprocal ()
+										# the value was exactly q
+				if lft.c == 0 and lft.d == 0:
+					return
+				continue
+			term = next (xs, None)
+			if term is None:
+				yield from _rational_terms (lft.a, lft.c)
+				return
+			read = read + 1
+			if read > budget:
+				raise ArithmeticError ("no output term after %d input terms" \
+											% budget)
+			lft.compose (linfractrans.LFT (term, 1, 1, 0))
+
+
+####----- end function -----
+
+
+def bihomographic (coeffs, x, y, budget=BUDGET):
+		""" Partial quotients of (axy + bx + cy + d) / (exy + fx + gy + h).
+
+		coeffs is [a, b, c, d, e, f, g, h].  As in homographic,
+		once the first terms are read both x and y lie in [1, oo],
+		and the value lies between those at the four corners,
+			a/e, (a+b)/(e+f), (a+c)/(e+g), (a+b+c+d)/(e+f+g+h).
+		When their floors agree, with no denominator changing
+		sign, the floor is output.  Otherwise a term is read from
+		the input whose edges of the square disagree.  When one
+		input ends the rest is a homographic function of the
+		other.  Raises ArithmeticError as homographic does.
+		"""
+
+		a, b, c, d, e, f, g, h = coeffs
+		xs = cf_terms (x)
+		ys = cf_terms (y)
+		p = next (xs, None)
+		q = next (ys, None)
+		if p is None or q is None:
+			raise ValueError ("empty continued fraction")
+										# x = p + 1/x', y = q + 1/y'
+		a, b, c, d = a * p + c, b * p + d, a, b
+		e, f, g, h = e * p + g, f * p + h, e, f
+		a, b, c, d = a * q + b, a, c * q + d, c
+		e, f, g, h = e * q + f, e, g * q + h, g
+		read = 0
+		toggle = 0
+		while (1):
+			corners = [_floor (a, e), _floor (a + b, e + f), \
+						_floor (a + c, e + g), _floor (a + b + c + d, e + f + g + h)]
+			dens = [e, e + f, e + g, e + f + g + h]
+			if None not in corners and corners.count (corners[0]) == 4 \
+					and (min (dens) > 0 or max (dens) < 0):
+				r = corners[0]
+				yield r
+				read = 0
+				a, b, c, d, e, f, g, h = e, f, g, h, \
+							a - r * e, b - r * f, c - r * g, d - r * h
+				if e == 0 and f == 0 and g == 0 and h == 0:
+					return
+				continue
+										# pairs of corners differing in x,
+										# then in y
+			x_bad = None in corners or corners[0] != corners[2] \
+						or corners[1] != corners[3]
+			y_bad = None in corners or corners[0] != corners[1] \
+						or corners[2] != corners[3]
+			if x_bad == y_bad:
+				toggle = 1 - toggle
+				use_x = toggle == 1
+			else:
+				use_x = x_bad
+			read = read + 1
+			if read > budget:
+				raise ArithmeticError ("no output term after %d input terms" \
+											% budget)
+			if use_x:
+				p = next (xs, None)
+				if p is None:
+										# x = oo, leaving (ay + b)/(ey + f)
+					if e == 0 and f == 0:
+						return
+					yield from _homographic_tail (linfractrans.LFT (a, b, e, f), \
+											ys, budget)
+					return
+				a, b, c, d = a * p + c, b * p + d, a, b
+				e, f, g, h = e * p + g, f * p + h, e, f
+			else:
+				q = next (ys, None)
+				if q is None:
+										# y = oo, leaving (ax + c)/(ex + g)
+					if e == 0 and g == 0:
+						return
+					yield from _homographic_tail (linfractrans.LFT (a, c, e, g), \
+											xs, budget)
+					return
+				a, b, c, d = a * q + b, a, c * q + d, c
+				e, f, g, h = e * q + f, e, g * q + h, g
+
+
+####----- end function -----
+
+
+def cf_add (x, y, budget=BUDGET):
+		""" Partial quotients of x + y, lazily. """
+
+		return bihomographic ([0, 1, 1, 0, 0, 0, 0, 1], x, y, budget)
+
+
+####----- end function -----
+
+
+def cf_sub (x, y, budget=BUDGET):
+		""" Partial quotients of x - y, lazily. """
+
+		return bihomographic ([0, 1, -1, 0, 0, 0, 0, 1], x, y, budget)
+
+
+####----- end function -----
+
+
+def cf_mul (x, y, budget=BUDGET):
+		""" Partial quotients of x * y, lazily. """
+
+		return bihomographic ([1, 0, 0, 0, 0, 0, 0, 1], x, y, budget)
+
+
+####----- end function -----
+
+
+def cf_div (x, y, budget=BUDGET):
+		""" Partial quotients of x / y, lazily. """
+
+		return bihomographic ([0, 1, 0, 0, 0, 0, 1, 0], x, y, budget)
+
+
+####----- end function -----
@@ -0,0 +1,58 @@
+#-----------------------------------------------------------
+# gosper_test -- unit tests for arithmetic on cf streams.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-----------------------------------------------------------
+
+
+import itertools
+import unittest
+import linfractrans
+from gosper import *
+from cntd_frac import Surd, cntd_frac, cflist_iter
+
+
+def take (terms, k):
+	return list (itertools.islice (terms, k))
+
+
+class Gosper_Tests (unittest.TestCase):
+
+	def testHomographic (self):
+										# (2x + 1)/(x + 3), x = sqrt(2)
+		lft = linfractrans.LFT (2, 1, 1, 3)
+		ans = take (homographic (lft, Surd (0, 1, 1, 2)), 12)
+		z = Surd (1, 2, 1, 2)
+		z.div (Surd (3, 1, 1, 2))
+		self.failUnless (ans == take (cflist_iter (cntd_frac (z)), 12))
+		ans = list (homographic (lft, [1,1,7,1,1,2]))
+		self.failUnless (ans == cntd_frac (Surd (2*81 + 43, 0, 81 + 3*43, 2)))
+		self.failUnless (lft.a == 2 and lft.d == 3)
+
+	def testArithmetic (self):
+		rt2 = Surd (0, 1, 1, 2)
+		rt3 = Surd (0, 1, 1, 3)
+		self.failUnless (take (cf_mul (rt2, rt3), 7) == [2,2,4,2,4,2,4])
+		self.failUnless (take (cf_add (rt2, rt2), 7) == [2,1,4,1,4,1,4])
+		self.failUnless (list (cf_add ([1,2], [0,3])) == [1,1,5])
+		self.failUnless (list (cf_div ([0], [1,[2]])) == [0])
+		x = Surd (3, 2, 7, 13)
+		y = Surd (-1, 1, 3, 13)
+		for op, func in [('add', cf_add), ('sub', cf_sub), ('mult', cf_mul), \
+							('div', cf_div)]:
+			z = Surd (x.a, x.b, x.d, x.r)
+			getattr (z, op) (y)
+			ans = take (func (x, [0, [1, 6, 1, 1, 1]]), 20)
+			self.failUnless (ans == take (cflist_iter (cntd_frac (z)), 20))
+
+	def testBudget (self):
+		rt2 = Surd (0, 1, 1, 2)
+		self.assertRaises (ArithmeticError, take, cf_mul (rt2, rt2, 50), 2)
+
+
+def main():
+	unittest.main()
+
+
+if __name__ == '__main__':
+	main()
@@ -20,7 +20,7 @@ class LFT:
 						------- .
 						c*z + d
 		We implement addition of constants, taking reciprocals,
-		and should do composition of these functions.  Also we
+		composition and powers of these functions.  Also we
 		want to find the fixed points of these functions.
 		"""
 
@@ -96,6 +96,42 @@ class LFT:
 			self.b = self.temp_b
 			LFT.normalize (self)
 
+										# composition self o y, that is
+										# the 2x2 matrix product self * y
+		def compose (self, y):
+			self.a, self.b, self.c, self.d = \
+						self.a * y.a + self.b * y.c, self.a * y.b + self.b * y.d, \
+						self.c * y.a + self.d * y.c, self.c * y.b + self.d * y.d
+			LFT.normalize (self)
+		def compose_replace (self, x, y):
+			self.a, self.b, self.c, self.d = \
+						x.a * y.a + x.b * y.c, x.a * y.b + x.b * y.d, \
+						x.c * y.a + x.d * y.c, x.c * y.b + x.d * y.d
+			LFT.normalize (self)
+
+										# inverse map, adjugate matrix
+		def inverse (self):
+			self.a, self.b, self.c, self.d = self.d, -self.b, -self.c, self.a
+			LFT.normalize (self)
+
+		def power (self, k):
+			""" Replace self by its k-th iterate, k an integer.
+
+			Repeated squaring, so O(log k) compositions.  k = 0
+			gives the identity z, and k < 0 powers of the inverse.
+			"""
+			if k < 0:
+				self.inverse ()
+				k = -k
+			base = LFT (self.a, self.b, self.c, self.d)
+			self.a, self.b, self.c, self.d = 1, 0, 0, 1
+			while k > 0:
+				if k & 1:
+					self.compose (base)
+				k = k >> 1
+				if k > 0:
+					base.compose (base)
+
 		def fixed_pts (self):
 			""" Returns a list of the fixed points.
 			
@@ -106,16 +142,12 @@ class LFT:
 			roots are ( -(d-a) \pm sqrt(disc)) / (2 * c).
 			"""
 			self.disc = pow(self.d - self.a, 2) + 4 * self.b * self.c			
-										# debugging
-			print ("### last linfractrans, a, b, c, d, and discriminant")
-			print ("###", self.a, self.b, self.c, self.d, self.disc)
-										# end debugging
+										# the LFT and discriminant are
+										# recorded by cf_stats when it
+										# is enabled
 
 			self.gcd1 = euclid_alg (self.d - self.a, self.c)
 			self.gcd  = euclid_alg (self.gcd1, self.b)
-										# debugging
-			#	print ("### gcd: ", self.gcd)
-										# end debugging
 			if self.gcd != 0:
 				self.d_minus_a = (self.d - self.a) // self.gcd
 				self.b = self.b // self.gcd
@@ -0,0 +1,180 @@
+#-------------------------------------------------------------
+# Module for big integer backends of elementary number theory.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-------------------------------------------------------------
+
+
+import math
+import os
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+
+
+class PythonBackend:
+    """ Backend of hand written loops over Python ints.
+
+    The reference implementations.  Every other backend must
+    return identical values, as plain ints.
+    """
+
+    name = 'python'
+
+    def gcd (self, a, b):
+        """ Euclidean algorithm, gcd of two integers. """
+        a, b = abs(a), abs(b)
+        while  b != 0:
+            r = a % b
+            a, b = b, r
+        return a
+
+    def ext_gcd (self, m, n):
+        """ Extended Euclidean algorithm, [g, a, b] with am + bn = g.
+
+        From Knuth, TAOCP vol. I, p. 14, on |m| and |n|.
+        Variables --
+            q, r -- quotient and remainder
+            apme, bpme -- a prime and b prime
+            t -- temporary
+        """
+        m, n = abs(m), abs(n)
+        q, r = m // n, m % n
+        apme = b = 1
+        a = bpme = 0
+
+        while  r != 0:
+            m, n = n, r
+            t = apme
+            apme = a
+            a = t - q * a
+            t = bpme
+            bpme = b
+            b = t - q * b
+                                        # reset q and r
+            q, r = m // n, m % n
+
+        return (n, a, b)
+
+    def isqrt (self, a):
+        """ Integer square root.
+
+        Argument is assumed to be a nonnegative integer.  We use the
+        float square root when the argument is <= 10^8.  If larger
+        we divide by an even power of 2, and then get the float
+        square root of the integer part, and multiply it back by
+        the appropriate power of 2.  That estimate starts the
+        Newton iteration ap <-- (ap + x/ap)/2 for the square root
+        of x.  Since we have the first 26 bits or so of the square
+        root, convergence is very quick - 4 or 5 iterations for a
+        50 digit number.
+        """
+        if (a < 1 + 10**8):
+            return (int (a**0.5))
+        shift = 2 * max (0, (a.bit_length() - 52) // 2)
+        approx = max (1, int ((a >> shift)**0.5)) << (shift // 2)
+                                        # one Newton step from any
+                                        # positive guess lands on or
+                                        # above the root, after which
+                                        # the iterates decrease to it.
+        approx = (approx + a // approx) // 2
+        while (1):
+            approx2 = (approx + a // approx) // 2
+            if (approx2 >= approx):
+                return approx
+            approx = approx2
+
+    def is_square (self, a):
+        """ True if a is a perfect square. """
+        if a < 0:
+            return False
+        r = self.isqrt (a)
+        return r * r == a
+
+    def mul (self, a, b):
+        return a * b
+
+
+class MathBackend (PythonBackend):
+    """ Backend using the C routines of the math module. """
+
+    name = 'math'
+
+    def gcd (self, a, b):
+        return math.gcd (a, b)
+
+    def isqrt (self, a):
+        return math.isqrt (a)
+
+
+class Gmpy2Backend (PythonBackend):
+    """ Backend using GMP through gmpy2.  Results are converted to int. """
+
+    name = 'gmpy2'
+
+    def gcd (self, a, b):
+        return int (gmpy2.gcd (a, b))
+
+    def ext_gcd (self, m, n):
+                                        # GMP also returns the minimal
+                                        # cofactors; keep the python
+                                        # error for n == 0
+        if n == 0:
+            raise ZeroDivisionError
+        g, a, b = gmpy2.gcdext (abs(m), abs(n))
+        return (int (g), int (a), int (b))
+
+    def isqrt (self, a):
+        return int (gmpy2.isqrt (a))
+
+    def is_square (self, a):
+        if a < 0:
+            return False
+        return bool (gmpy2.is_square (a))
+
+    def mul (self, a, b):
+        return int (gmpy2.mpz (a) * b)
+
+
+BACKENDS = {'python': PythonBackend (), 'math': MathBackend ()}
+if gmpy2 is not None:
+    BACKENDS['gmpy2'] = Gmpy2Backend ()
+
+
+
+def get_backend (name=None):
+    """ Returns the backend called name, or the current one if None. """
+
+    if name is None:
+        return _current
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError ("unknown or unavailable backend: " + repr(name))
+
+####----- end function -----
+
+
+def set_backend (name):
+    """ Make name the backend used when a call does not give one.
+
+    The default is chosen at import: the CF_BACKEND environment
+    variable if set, else gmpy2 when installed, else math.
+    """
+
+    global _current
+    _current = get_backend (name)
+    return _current
+
+####----- end function -----
+
+
+if os.environ.get ('CF_BACKEND'):
+    _current = get_backend (os.environ['CF_BACKEND'])
+elif gmpy2 is not None:
+    _current = BACKENDS['gmpy2']
+else:
+    _current = BACKENDS['math']
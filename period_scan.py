@@ -0,0 +1,225 @@
+#-------------------------------------------------------------------------------
+#  Module for scanning the periods of sqrt(D) over ranges of D.
+#
+#  Copyright 2026 Jesse I. Deutsch
+#
+#   $Id:$
+#
+#  Usage --
+#	python3 period_scan.py out_dir d_lo d_hi [-c chunk] [-j workers] [--units]
+#
+#  The range d_lo <= D < d_hi is cut into chunks, which run on
+#  a pool of processes.  Each finished chunk is a file
+#			out_dir/chunk_<lo>_<hi>.txt
+#  with a line per non-square D,
+#			D  L  n  [p  q]
+#  where L is the period length of sqrt(D), n = (-1)^L is the
+#  norm of the unit p + q*sqrt(D) of Z[sqrt(D)], and p, q are
+#  only written with --units.  out_dir/checkpoint.json lists the
+#  finished chunks, so running the same command again after the
+#  job is killed does only the chunks still missing.
+#-------------------------------------------------------------------------------
+
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cntd_frac import cntd_frac, cf_convergent
+from surd import Surd, isqrt
+
+
+CHUNK = 10000
+CHECKPOINT = 'checkpoint.json'
+
+
+
+def _write_atomic (path, text):
+		""" Write text to path so that readers see all of it or none. """
+
+		tmp = path + '.tmp'
+		with open (tmp, 'w') as f:
+			f.write (text)
+			f.flush ()
+			os.fsync (f.fileno ())
+		os.replace (tmp, path)
+
+
+####----- end function -----
+
+
+def chunk_path (out_dir, lo, hi):
+		return os.path.join (out_dir, 'chunk_%d_%d.txt' % (lo, hi))
+
+
+####----- end function -----
+
+
+def scan_record (D, units=False):
+		""" [D, L, n] or [D, L, n, p, q] for sqrt(D), D not a square.
+
+		L is the period length and n = (-1)^L.  p/q is the
+		convergent just before the end of the first period, so
+		p + q*sqrt(D) is the fundamental unit of Z[sqrt(D)], of
+		norm n.
+		"""
+
+		cflist = cntd_frac (Surd (0, 1, 1, D))
+		L = len (cflist[1])
+		rec = [D, L, (-1)**L]
+		if units:
+			rec.extend (cf_convergent (cflist, L - 1))
+		return rec
+
+
+####----- end function -----
+
+
+def scan_chunk (out_dir, lo, hi, units=False):
+		""" Scan lo <= D < hi into its chunk file.
+
+		Runs in a worker process.  Returns [lo, hi, count], count
+		being the number of non-square D.
+		"""
+
+		lines = []
+		for D in range (lo, hi):
+			rt_D = isqrt (D)
+			if rt_D * rt_D == D:
+				continue
+			rec = scan_record (D, units)
+			lines.append (' '.join (str (v) for v in rec) + '\n')
+		_write_atomic (chunk_path (out_dir, lo, hi), ''.join (lines))
+		return [lo, hi, len (lines)]
+
+
+####----- end function -----
+
+
+def _load_checkpoint (out_dir, params):
+		""" Chunk starts already done, for a scan with these params. """
+
+		path = os.path.join (out_dir, CHECKPOINT)
+		if not os.path.exists (path):
+			return set ()
+		with open (path) as f:
+			state = json.load (f)
+		if state['params'] != params:
+			raise ValueError ("checkpoint in %s is for a different scan: %r" \
+								% (out_dir, state['params']))
+										# a chunk counts as done only if
+										# its file is there too
+		done = set ()
+		for lo in state['done']:
+			hi = min (lo + params['chunk'], params['d_hi'])
+			if os.path.exists (chunk_path (out_dir, lo, hi)):
+				done.add (lo)
+		return done
+
+
+####----- end function -----
+
+
+def _save_checkpoint (out_dir, params, done):
+		state = {'params': params, 'done': sorted (done)}
+		_write_atomic (os.path.join (out_dir, CHECKPOINT), json.dumps (state))
+
+
+####----- end function -----
+
+
+def _print_report (stats):
+		print ("%d/%d chunks, %d radicands, %.0f per second" \
+				% (stats['chunks_done'], stats['chunks'], stats['radicands'], \
+				stats['rate']), file=sys.stderr)
+
+
+####----- end function -----
+
+
+def scan (out_dir, d_lo, d_hi, chunk=CHUNK, workers=None, units=False, \
+			report=_print_report):
+		""" Scan d_lo <= D < d_hi on a process pool, resumably.
+
+		workers None means one per core.  Chunks already in the
+		checkpoint are skipped.  After each chunk report (stats)
+		is called, if not None, with a copy of the counts so far
+		this run and the throughput in radicands per second.
+		Returns the final stats.
+		"""
+
+		if not (1 <= d_lo <= d_hi) or chunk < 1:
+			raise ValueError ("need 1 <= d_lo <= d_hi and chunk >= 1")
+		os.makedirs (out_dir, exist_ok=True)
+		params = {'d_lo': d_lo, 'd_hi': d_hi, 'chunk': chunk, 'units': units}
+		done = _load_checkpoint (out_dir, params)
+		todo = [lo for lo in range (d_lo, d_hi, chunk) if lo not in done]
+		stats = {'chunks': len (range (d_lo, d_hi, chunk)), \
+				'chunks_done': len (done), 'radicands': 0, 'seconds': 0.0, \
+				'rate': 0.0}
+		start = time.perf_counter ()
+		with ProcessPoolExecutor (max_workers=workers) as pool:
+			futures = [pool.submit (scan_chunk, out_dir, lo, \
+							min (lo + chunk, d_hi), units) for lo in todo]
+			for future in as_completed (futures):
+				lo, hi, count = future.result ()
+				done.add (lo)
+				_save_checkpoint (out_dir, params, done)
+				stats['chunks_done'] = len (done)
+				stats['radicands'] = stats['radicands'] + count
+				stats['seconds'] = time.perf_counter () - start
+				if stats['seconds'] > 0:
+					stats['rate'] = stats['radicands'] / stats['seconds']
+				if report is not None:
+					report (dict (stats))
+		_save_checkpoint (out_dir, params, done)
+		return stats
+
+
+####----- end function -----
+
+
+def read_scan (out_dir):
+		""" The records of the finished chunks, in order of D.
+
+		Each is [D, L, n] or [D, L, n, p, q], as ints.
+		"""
+
+		names = [n for n in os.listdir (out_dir) \
+					if n.startswith ('chunk_') and n.endswith ('.txt')]
+		names.sort (key=lambda n: int (n.split ('_')[1]))
+		for name in names:
+			with open (os.path.join (out_dir, name)) as f:
+				for line in f:
+					yield [int (v) for v in line.split ()]
+
+
+####----- end function -----
+
+
+def main (argv=None):
+		parser = argparse.ArgumentParser (description="Periods of sqrt(D) " \
+					"for d_lo <= D < d_hi.")
+		parser.add_argument ('out_dir')
+		parser.add_argument ('d_lo', type=int)
+		parser.add_argument ('d_hi', type=int)
+		parser.add_argument ('-c', '--chunk', type=int, default=CHUNK)
+		parser.add_argument ('-j', '--workers', type=int, default=None)
+		parser.add_argument ('--units', action='store_true', \
+					help="also write the fundamental units")
+		args = parser.parse_args (argv)
+		stats = scan (args.out_dir, args.d_lo, args.d_hi, args.chunk, \
+						args.workers, args.units)
+		print ("done: %d radicands in %.1f s" \
+				% (stats['radicands'], stats['seconds']))
+		return 0
+
+
+####----- end function -----
+
+
+if __name__ == '__main__':
+	sys.exit (main ())
@@ -0,0 +1,63 @@
+#-----------------------------------------------------------
+# period_scan_test -- unit tests for the period scanner.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-----------------------------------------------------------
+
+
+import os
+import shutil
+import tempfile
+import unittest
+from period_scan import *
+from cntd_frac import cntd_frac, Surd
+
+
+class Period_Scan_Tests (unittest.TestCase):
+
+	def setUp (self):
+		self.dir = tempfile.mkdtemp ()
+
+	def tearDown (self):
+		shutil.rmtree (self.dir)
+
+	def testRecord (self):
+		self.failUnless (scan_record (97, True) == [97, 11, -1, 5604, 569])
+		self.failUnless (scan_record (94) == [94, 16, 1])
+		D, L, n, p, q = scan_record (1000099, True)
+		self.failUnless (p*p - D*q*q == n)
+
+	def testScanResume (self):
+		reports = []
+		stats = scan (self.dir, 2, 230, chunk=50, workers=2, units=True, \
+						report=reports.append)
+		self.failUnless (stats['chunks'] == 5 and stats['chunks_done'] == 5)
+		self.failUnless (stats['radicands'] == 228 - 14)
+										# one report per chunk, each
+										# its own snapshot
+		self.failUnless (len (reports) == 5)
+		self.failUnless ([r['chunks_done'] for r in reports] == [1, 2, 3, 4, 5])
+		self.failUnless (all (r['rate'] > 0 for r in reports))
+		self.failUnless (reports[-1]['radicands'] == stats['radicands'])
+		self.failUnless (reports[0]['radicands'] < reports[-1]['radicands'])
+		recs = list (read_scan (self.dir))
+		self.failUnless ([r[0] for r in recs] == \
+							[D for D in range (2, 230) if isqrt (D)**2 != D])
+		for D, L, n, p, q in recs:
+			self.failUnless (L == len (cntd_frac (Surd (0, 1, 1, D))[1]))
+			self.failUnless (p*p - D*q*q == n)
+										# a killed run: one chunk lost
+		os.remove (chunk_path (self.dir, 102, 152))
+		stats = scan (self.dir, 2, 230, chunk=50, workers=2, units=True, \
+						report=None)
+		self.failUnless (stats['radicands'] == 50 - 2)
+		self.failUnless (list (read_scan (self.dir)) == recs)
+		self.assertRaises (ValueError, scan, self.dir, 2, 230, 40)
+
+
+def main():
+	unittest.main()
+
+
+if __name__ == '__main__':
+	main()
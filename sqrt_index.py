@@ -0,0 +1,195 @@
+#-------------------------------------------------------------------------------
+#  Module for an on-disk index of the continued fractions of sqrt(D).
+#
+#  Copyright 2026 Jesse I. Deutsch
+#
+#   $Id:$
+#
+#  Usage --
+#	python3 sqrt_index.py file d_lo d_hi
+#
+#  writes the expansions of sqrt(D) for d_lo <= D < d_hi to file.
+#
+#  File layout, all little endian --
+#	header	magic 'CFSQ', version, item size (4 or 8 bytes), then
+#			d_lo and d_hi as 8 byte unsigned
+#	offsets	d_hi - d_lo + 1 entries of 8 bytes, item counts from
+#			the start of the records; D has the items from
+#			offsets[D - d_lo] to offsets[D - d_lo + 1]
+#	records	for each D, the leading term a_0 and then the period,
+#			as unsigned items; empty for a perfect square
+#-------------------------------------------------------------------------------
+
+
+import mmap
+import struct
+import sys
+from array import array
+
+import cntd_frac
+from surd import Surd, isqrt
+
+
+MAGIC = b'CFSQ'
+VERSION = 1
+HEADER = struct.Struct ('<4sIIQQ')
+										# array typecodes of 4 and 8
+										# byte unsigned integers
+ITEM_CODES = {4: 'I', 8: 'Q'}
+if array ('L').itemsize == 4:
+	ITEM_CODES[4] = 'L'
+
+
+
+def _item_size (d_hi):
+		""" 4 bytes if every quotient below d_hi fits, else 8. """
+
+		if 2 * isqrt (max (d_hi - 1, 0)) < 2**32:
+			return 4
+		return 8
+
+
+####----- end function -----
+
+
+def _to_le (arr):
+		if sys.byteorder == 'big':
+			arr = array (arr.typecode, arr)
+			arr.byteswap ()
+		return arr
+
+
+####----- end function -----
+
+
+def write_index (path, d_lo, d_hi):
+		""" Write the expansions of sqrt(D), d_lo <= D < d_hi, to path.
+
+		The records are streamed out one D at a time after a
+		placeholder offset table, which is filled in at the end.
+		Returns the number of radicands that are not squares.
+		"""
+
+		if not (1 <= d_lo <= d_hi):
+			raise ValueError ("need 1 <= d_lo <= d_hi")
+		size = _item_size (d_hi)
+		code = ITEM_CODES[size]
+		n = d_hi - d_lo
+		offsets = array ('Q', [0])
+		count = 0
+		with open (path, 'wb') as f:
+			f.write (HEADER.pack (MAGIC, VERSION, size, d_lo, d_hi))
+			table_pos = f.tell ()
+			f.write (bytes (8 * (n + 1)))
+			for D in range (d_lo, d_hi):
+				rt_D = isqrt (D)
+				if rt_D * rt_D == D:
+					offsets.append (offsets[-1])
+					continue
+				cflist = cntd_frac.cntd_frac (Surd (0, 1, 1, D))
+				rec = array (code, [cflist[0]] + cflist[1])
+				f.write (_to_le (rec).tobytes ())
+				offsets.append (offsets[-1] + len (rec))
+				count = count + 1
+			f.seek (table_pos)
+			f.write (_to_le (offsets).tobytes ())
+		return count
+
+
+####----- end function -----
+
+
+
+class SqrtIndex:
+		""" Reader for a file from write_index.
+
+		The file is memory mapped, so only the pages touched by a
+		lookup are read from disk.  Use as a context manager or
+		call close ().
+		"""
+
+		def __init__ (self, path):
+			self.file = open (path, 'rb')
+			try:
+				self.map = mmap.mmap (self.file.fileno (), 0, \
+										access=mmap.ACCESS_READ)
+			except ValueError:
+				self.file.close ()
+				raise ValueError ("not a sqrt index file: " + repr (path))
+			try:
+				magic, version, size, self.d_lo, self.d_hi = \
+							HEADER.unpack_from (self.map, 0)
+				if magic != MAGIC or version != VERSION \
+						or size not in ITEM_CODES:
+					raise ValueError ("not a sqrt index file: " + repr (path))
+			except (ValueError, struct.error):
+				self.close ()
+				raise ValueError ("not a sqrt index file: " + repr (path))
+			self.item = struct.Struct ('<' + 'IQ'[size // 8])
+			self.table = HEADER.size
+			self.records = self.table + 8 * (self.d_hi - self.d_lo + 1)
+
+		def __enter__ (self):
+			return self
+
+		def __exit__ (self, *exc):
+			self.close ()
+
+		def __contains__ (self, D):
+			return self.d_lo <= D < self.d_hi
+
+		def close (self):
+			if self.map is not None:
+				self.map.close ()
+				self.map = None
+			self.file.close ()
+
+		def lookup (self, D):
+			""" cntd_frac (Surd (0, 1, 1, D)) from the file.
+
+			None when D is outside the range or a perfect square.
+			"""
+
+			if not (self.d_lo <= D < self.d_hi):
+				return None
+			pos = self.table + 8 * (D - self.d_lo)
+			start, end = struct.unpack_from ('<QQ', self.map, pos)
+			if start == end:
+				return None
+			size = self.item.size
+			fmt = '<%d%s' % (end - start, self.item.format[-1])
+			terms = list (struct.unpack_from (fmt, self.map, \
+										self.records + size * start))
+			return [terms[0], terms[1:]]
+
+
+#----- end of class -------
+
+
+
+def use_index (path):
+		""" Let cntd_frac answer sqrt(D) from the index file at path.
+
+		path None stops using the current index.  Returns the
+		SqrtIndex, or None.
+		"""
+
+		old = cntd_frac.sqrt_index
+		if path is None:
+			cntd_frac.sqrt_index = None
+		else:
+			cntd_frac.sqrt_index = SqrtIndex (path)
+		if old is not None:
+			old.close ()
+		return cntd_frac.sqrt_index
+
+
+####----- end function -----
+
+
+if __name__ == '__main__':
+	if len (sys.argv) != 4:
+		print ("usage: python3 sqrt_index.py file d_lo d_hi")
+		sys.exit (2)
+	found = write_index (sys.argv[1], int (sys.argv[2]), int (sys.argv[3]))
+	print (found, "expansions written")
@@ -0,0 +1,89 @@
+#-----------------------------------------------------------
+# sqrt_index_test -- unit tests for the sqrt(D) index file.
+#
+# Copyright 2026 Jesse I. Deutsch
+#-----------------------------------------------------------
+
+
+import os
+import struct
+import tempfile
+import unittest
+import cntd_frac
+from sqrt_index import *
+from cntd_frac import Surd
+
+
+class Sqrt_Index_Tests (unittest.TestCase):
+
+	def setUp (self):
+		fd, self.path = tempfile.mkstemp ()
+		os.close (fd)
+
+	def tearDown (self):
+		use_index (None)
+		os.remove (self.path)
+
+	def testLookup (self):
+		ans = write_index (self.path, 2, 200)
+		self.failUnless (ans == 198 - 13)
+		with SqrtIndex (self.path) as idx:
+			self.failUnless (idx.lookup (97) == [9,[1,5,1,1,1,1,1,1,5,1,18]])
+			self.failUnless (idx.lookup (2) == [1,[2]])
+			self.failUnless (idx.lookup (196) is None)
+			self.failUnless (idx.lookup (200) is None)
+			self.failIf (1 in idx)
+			for D in range (2, 200):
+				ans = idx.lookup (D)
+				if ans is not None:
+					self.failUnless (ans == cntd_frac.cntd_frac (Surd (0,1,1,D)))
+
+	def testUseIndex (self):
+		write_index (self.path, 90, 100)
+		idx = use_index (self.path)
+		hits = []
+		lookup = idx.lookup
+		def counted (D):
+			ans = lookup (D)
+			hits.append ([D, ans is not None])
+			return ans
+		idx.lookup = counted
+		ans = cntd_frac.cntd_frac (Surd (0, 1, 1, 97))
+		self.failUnless (ans == [9,[1,5,1,1,1,1,1,1,5,1,18]])
+		self.failUnless (hits == [[97, True]])
+										# D past d_hi is computed
+		ans = cntd_frac.cntd_frac (Surd (0, 1, 1, 103))
+		self.failUnless (ans == [10,[6,1,2,1,1,9,1,1,2,1,6,20]])
+		self.failUnless (hits[-1] == [103, False])
+		ans = cntd_frac.cntd_frac (Surd (0, 1, 1, 89))
+		self.failUnless (ans == [9,[2,3,3,2,18]])
+		self.failUnless (hits[-1] == [89, False])
+										# not sqrt(D), no lookup
+		ans = cntd_frac.cntd_frac (Surd (1, 1, 2, 97))
+		self.failUnless (ans[0] == 5)
+		self.failUnless (len (hits) == 3)
+
+	def testMarkerRecord (self):
+										# the record of the square 100 is
+										# empty, so that of 101 starts the
+										# records; mark its leading term
+										# and look for the mark
+		write_index (self.path, 100, 102)
+		with open (self.path, 'r+b') as f:
+			f.seek (HEADER.size + 8 * 3)
+			f.write (struct.pack ('<I', 7))
+		use_index (self.path)
+		self.failUnless (cntd_frac.cntd_frac (Surd (0, 1, 1, 101)) == [7,[20]])
+
+	def testBadFile (self):
+		with open (self.path, 'wb') as f:
+			f.write (b'not an index file at all, not at all')
+		self.assertRaises (ValueError, SqrtIndex, self.path)
+
+
+def main():
+	unittest.main()
+
+
+if __name__ == '__main__':
+	main()
@@ -7,7 +7,15 @@
 #-------------------------------------------------------------
 
 
+import math
+
 from elem_nt import euclid_alg, square_part
+from nt_backend import get_backend
+
+
+									# CfCache used by fund_unit,
+									# see cf_cache.py
+result_cache = None
 
 
 class Surd:
@@ -24,6 +32,20 @@ class Surd:
 		surds.
 		"""
 
+										# only the four coefficients
+										# are stored, no per-instance
+										# dict and no scratch attributes
+		__slots__ = ('a', 'b', 'd', 'r')
+
+										# lazy mode: add, sub, mult, div
+										# and reciprocal skip the gcds
+										# until a coefficient reaches
+										# lazy_bits bits; str, floor,
+										# pq_form, norm and settle
+										# normalize first.  Off by default.
+		lazy = False
+		lazy_bits = 256
+
 		def __init__ (self, a, b, d, r):
 			self.a = a
 			self.b = b
@@ -36,17 +58,18 @@ class Surd:
 										# string version of object
 										# useful for print
 		def __str__(self):
+			Surd.settle (self)
 			sgn = '+'
-			self.b_abs = self.b
+			b_abs = self.b
 			if self.b < 0:
 				sgn = '-'
-				self.b_abs = -1 * self.b
+				b_abs = -1 * self.b
 										# case where denom is not 1
 			if self.d != 1:
-				return "[" + repr (self.a) + sgn + repr(self.b_abs) + "*rt(" \
+				return "[" + repr (self.a) + sgn + repr(b_abs) + "*rt(" \
 					+ repr(self.r) + ")] / " + repr(self.d)
 										# case where denominator is 1
-			return  repr (self.a) + sgn + repr(self.b_abs) + "*rt(" \
+			return  repr (self.a) + sgn + repr(b_abs) + "*rt(" \
 				+ repr (self.r) + ")"
 
 		def normalize (self):
@@ -62,100 +85,97 @@ class Surd:
 					return
 										# a is zero, b not zero
 				else:
-					self.gcd = euclid_alg (self.b, self.d)
-					self.b = self.b // self.gcd
-					self.d = self.d // self.gcd											
+					gcd = euclid_alg (self.b, self.d)
+					self.b = self.b // gcd
+					self.d = self.d // gcd											
 					return
 										# b is zero, a not zero
 			if self.b == 0:
-					self.gcd = euclid_alg (self.a, self.d)
-					self.a = self.a // self.gcd
-					self.d = self.d // self.gcd
+					gcd = euclid_alg (self.a, self.d)
+					self.a = self.a // gcd
+					self.d = self.d // gcd
 					return
 										# both a and b are not zero
-			self.gcd = euclid_alg (self.a, self.b)
-			self.gcd = euclid_alg (self.gcd, self.d)
-			self.a   = self.a // self.gcd
-			self.b   = self.b // self.gcd
-			self.d   = self.d // self.gcd
+			gcd = euclid_alg (self.a, self.b)
+			gcd = euclid_alg (gcd, self.d)
+			self.a   = self.a // gcd
+			self.b   = self.b // gcd
+			self.d   = self.d // gcd
 			return										
 
+										# normalize after arithmetic,
+										# put off in lazy mode while the
+										# coefficients are small
+		def tidy (self):
+			if Surd.lazy and self.d.bit_length () < Surd.lazy_bits \
+					and self.a.bit_length () < Surd.lazy_bits \
+					and self.b.bit_length () < Surd.lazy_bits:
+				return
+			Surd.normalize (self)
+
+										# normalize what lazy mode put off
+		def settle (self):
+			if Surd.lazy:
+				Surd.normalize (self)
+
 
+										# temps are locals, so x and y
+										# may be self in the _replace
+										# forms, e.g. a.mult_replace(a,a)
 		def add (self, y):
-			self.temp_a = self.a * y.d + self.d * y.a
-			self.temp_b = self.b * y.d + self.d * y.b
-			self.temp_d = self.d * y.d
-			self.a = self.temp_a
-			self.b = self.temp_b
-			self.d = self.temp_d
-			Surd.normalize (self)
+			self.a, self.b, self.d = self.a * y.d + self.d * y.a, \
+								self.b * y.d + self.d * y.b, self.d * y.d
+			Surd.tidy (self)
 		def add_replace (self, x, y):
-			self.temp_a = x.a * y.d + x.d * y.a
-			self.temp_b = x.b * y.d + x.d * y.b
-			self.temp_d = x.d * y.d
-			self.a = self.temp_a
-			self.b = self.temp_b
-			self.d = self.temp_d
-			Surd.normalize (self)
+			self.a, self.b, self.d = x.a * y.d + x.d * y.a, \
+								x.b * y.d + x.d * y.b, x.d * y.d
+			Surd.tidy (self)
 
 		def sub (self, y):
-			self.temp_a = self.a * y.d - self.d * y.a
-			self.temp_b = self.b * y.d - self.d * y.b
-			self.temp_d = self.d * y.d
-			self.a = self.temp_a
-			self.b = self.temp_b
-			self.d = self.temp_d
-			Surd.normalize (self)
+			self.a, self.b, self.d = self.a * y.d - self.d * y.a, \
+								self.b * y.d - self.d * y.b, self.d * y.d
+			Surd.tidy (self)
 		def sub_replace (self, x, y):
-			self.temp_a = x.a * y.d - x.d * y.a
-			self.temp_b = x.b * y.d - x.d * y.b
-			self.temp_d = x.d * y.d
-			self.a = self.temp_a
-			self.b = self.temp_b
-			self.d = self.temp_d
-			Surd.normalize (self)
+			self.a, self.b, self.d = x.a * y.d - x.d * y.a, \
+								x.b * y.d - x.d * y.b, x.d * y.d
+			Surd.tidy (self)
 
-										# need temps
 		def mult (self, y):
-			self.temp_a = self.a * y.a + self.r * self.b * y.b
-			self.temp_b = self.a * y.b + self.b * y.a
-			self.temp_d = self.d * y.d
-			self.a = self.temp_a
-			self.b = self.temp_b
-			self.d = self.temp_d
-			Surd.normalize (self)
+			self.a, self.b, self.d = self.a * y.a + self.r * self.b * y.b, \
+								self.a * y.b + self.b * y.a, self.d * y.d
+			Surd.tidy (self)
 		def mult_replace (self, x, y):
-										# need temp as x.rtnl used
-										# on next line.  Resolves 
-										# a.mult_replace(a,a) bug.
-			self.temp_a = x.a * y.a + x.r * x.b * y.b
-			self.temp_b = x.a * y.b + x.b * y.a
-			self.temp_d = x.d * y.d
-			self.a = self.temp_a
-			self.b = self.temp_b
-			self.d = self.temp_d
-			Surd.normalize (self)
-
+			self.a, self.b, self.d = x.a * y.a + x.r * x.b * y.b, \
+								x.a * y.b + x.b * y.a, x.d * y.d
+			Surd.tidy (self)
 
-										# need temps
 		def div (self, y):
-			self.temp_a = self.b * y.b * y.d * y.r  - self.a * y.a * y.d
-			self.temp_b = y.d * (self.a * y.b - y.a * self.b)
-			self.temp_d = self.d * (y.b * y.b * y.r - y.a * y.a)
-			self.a = self.temp_a
-			self.b = self.temp_b
-			self.d = self.temp_d
-			Surd.normalize (self)
+			self.a, self.b, self.d = \
+						self.b * y.b * y.d * y.r  - self.a * y.a * y.d, \
+						y.d * (self.a * y.b - y.a * self.b), \
+						self.d * (y.b * y.b * y.r - y.a * y.a)
+			Surd.tidy (self)
 		def div_replace (self, x, y):
-										# need temps.  Resolves 
-										# a.mult_replace(a,a) bug.
-			self.temp_a = x.b * y.b * y.d * y.r  - x.a * y.a * y.d
-			self.temp_b = y.d * (x.a * y.b - y.a * x.b)
-			self.temp_d = x.d * (y.b * y.b * y.r - y.a * y.a)
-			self.a = self.temp_a
-			self.b = self.temp_b
-			self.d = self.temp_d
-			Surd.normalize (self)
+			self.a, self.b, self.d = \
+						x.b * y.b * y.d * y.r  - x.a * y.a * y.d, \
+						y.d * (x.a * y.b - y.a * x.b), \
+						x.d * (y.b * y.b * y.r - y.a * y.a)
+			Surd.tidy (self)
+
+										# in place 1/self, no Surd(1,..)
+		def reciprocal (self):
+			if self.a == 0 and self.b == 0:
+				raise ZeroDivisionError
+			self.a, self.b, self.d = self.d * self.a, -self.d * self.b, \
+								self.a * self.a - self.r * self.b * self.b
+			Surd.tidy (self)
+
+										# integer shifts keep the gcd of
+										# (a, b, d), so no normalize
+		def add_int (self, n):
+			self.a = self.a + n * self.d
+		def sub_int (self, n):
+			self.a = self.a - n * self.d
 
 										# conjugate wrt Q(sqrt(r))
 		def conj (self, x):
@@ -165,24 +185,61 @@ class Surd:
 			self.r = x.r
 
 		def norm (self):
-			self.temp_a = self.a * self.a - self.r * self.b * self.b
-			self.temp_b = 0
-			self.temp_d = self.d * self.d
-			self.temp_norm = Surd (self.temp_a, self.temp_b, \
-									self.temp_d, self.r) 
-			return self.temp_norm
+			Surd.settle (self)
+			return Surd (self.a * self.a - self.r * self.b * self.b, 0, \
+							self.d * self.d, self.r) 
 
 		def copy_in (self, x):
 			self.a = x.a
 			self.b = x.b
-			self.c = x.c
+			self.d = x.d
 			self.r = x.r
 		def copy_out (self, x):
 			x.a = self.a
 			x.b = self.b		
-			x.c = self.c
-			x.d = self.d		
+			x.d = self.d
+			x.r = self.r		
+
+
+		def floor (self):
+			""" Exact floor of the surd.
 
+			Integer only, with one isqrt of b*b*r, so it is correct
+			for radicands of any size.  For b != 0 the numerator
+			a + b*sqrt(r) is not an integer, and its floor divided
+			by d (d > 0) gives the floor of the surd.
+			"""
+			Surd.settle (self)
+			if self.b == 0:
+				return self.a // self.d
+			b_sq_r = self.b * self.b * self.r
+			rt = isqrt (b_sq_r)
+			if rt * rt == b_sq_r:
+										# r a square, value rational
+				if self.b > 0:
+					return (self.a + rt) // self.d
+				return (self.a - rt) // self.d
+			if self.b > 0:
+				return (self.a + rt) // self.d
+			return (self.a - rt - 1) // self.d
+
+		def pq_form (self):
+			""" Returns [P, Q, D] with surd = (P + sqrt(D)) / Q.
+
+			Here Q divides D - P*P, the form used by the classical
+			integer recurrence for the continued fraction of a
+			quadratic irrational.  Q is negative when b is.
+			"""
+			Surd.settle (self)
+										# scale top and bottom by k
+										# so that Q | D - P^2
+			k = self.d // euclid_alg (self.d, \
+								self.b * self.b * self.r - self.a * self.a)
+			sgn = 1
+			if self.b < 0:
+				sgn = -1
+			return [sgn * k * self.a, sgn * k * self.d, \
+						k * k * self.b * self.b * self.r]
 
 									# FIX!!! check if totally positive, >> 0
 		def is_tot_pos (self):
@@ -195,92 +252,186 @@ class Surd:
 #----- end of class -------
 
 
-def isqrt (a):
+def isqrt (a, backend=None):
 		""" Integer square root.
 
-		Argument is assumed to be a positive integer.  We use the
-		float square root when the argument is <= 10^8.  If larger
-		we divide by an even power of 10, and then get the float
-		square root of the integer part, and multiply it back by
-		the appropriate power of 10.  Then we use the estimate
-		       sqrt(ap^2 + b) \approx  ap + b/(2*ap)
-		which is actually equivalent to the ap <-- (ap + x/ap)/2	    
-		iteration for the square root of x.  However, since we
-		have the first few digits of the square root, convergence
-		is very quick - 4 or 5 iterations for a 50 digit number.
+		Argument is assumed to be a nonnegative integer.  Returns
+		the floor of its square root, computed by the big integer
+		backend (see nt_backend), the current one by default.
+		The pure Python backend starts Newton's method from a
+		float estimate of the leading digits.
 		"""
 
-		if (a < 1 + 10**8):
-			return (int (a**0.5))
-		else:	
-			b = len(str(a))
-			c = b // 8
-			d = a // 10**(8*c - 4)
-			approx = int (d**0.5) * 10**(4*c - 2)
-			#						----- Debugging -----
-			#	print b, c, d
-			#	print approx
-			#						------ end debugging -----
-			while (1):
-				b = a - approx*approx
-				approx2 = approx + (b // (2*approx))
-				#						----- Debugging -----
-				#	print approx2				
-				#						----- end debugging -----
-				if (approx2 == approx):
-					return approx
-				approx = approx2	
+		return get_backend (backend).isqrt (a)
 
 
 ####----- end function -----
 
 
 
-def fund_unit (m):
-	""" Returns fundamental unit of Q(sqrt(m)).
+def pq_floor (P, Q, rt_D):
+	""" Floor of (P + sqrt(D)) / Q given rt_D = isqrt(D).
 
-	Note that m must be square free and > 1.  We use the 
-	elementary 	algorithm in Marcus's book.
-	Variables --
-				test_4_square --
+	D is not a square, so P + sqrt(D) lies strictly between
+	P + rt_D and P + rt_D + 1.
 	"""
 
+	if Q > 0:
+		return (P + rt_D) // Q
+	return (P + rt_D + 1) // Q
+
+####----- end function -----
+
+
+def unit_check (m):
+	""" Error string if m is not a valid field parameter, else None. """
+
 	if m <= 1:
 		return "ERROR: m must be greater than 1."
 	m_sq_fctr = square_part (m)
 	if m_sq_fctr[0] > 1:
 		return "ERROR: m must be square free"
-	
-								# Case of m is 2, 3 mod 4.  The
-								# algorithm-- check mb^2 +-1 for
-								# smallest positive b that makes
-								# a perfect square, a^2.  Then
-								# a + b sqrt(m) is the fund. unit.
-	if m % 4 == 2 or m % 4 == 3:
-		b = 1
-		while 1:
-			test_4_square = m*b*b - 1
-			test_a = isqrt (test_4_square)
-			if test_4_square - test_a**2 == 0:
-				return Surd (test_a, b, 1, m)
-			test_4_square = m*b*b + 1
-			test_a = isqrt (test_4_square)
-			if test_4_square - test_a**2 == 0:
-				return Surd (test_a, b, 1, m)
-			b += 1
-								# Case of m = 1 mod 4
+	return None
+
+####----- end function -----
+
+
+def unit_period (m):
+	""" The complete quotients over one period for the unit of Q(sqrt(m)).
+
+	Generator of [P, Q, a], where (P + sqrt(m)) / Q is the next
+	complete quotient and a the partial quotient taken to reach
+	it, in the expansion of w = sqrt(m) for m = 2, 3 mod 4 and of
+	w = (1 + sqrt(m)) / 2 for m = 1 mod 4.  The ring of integers
+	is Z[w].  It stops when Q returns to its starting value,
+	which closes the period.  The product of the complete
+	quotients yielded is the fundamental unit.
+	"""
+
+								# w = (P + sqrt(m)) / Q with
+								# Q | m - P^2
+	if m % 4 == 1:
+		P, Q = 1, 2
+	else:
+		P, Q = 0, 1
+	Q_start = Q
+	rt_m = isqrt (m)
+	while 1:
+		a = pq_floor (P, Q, rt_m)
+		P = a * Q - P
+		Q = (m - P * P) // Q
+		yield [P, Q, a]
+		if Q == Q_start:
+			return
+
+####----- end function -----
+
+
+def fund_unit (m):
+	""" Returns fundamental unit of Q(sqrt(m)).
+
+	Note that m must be square free and > 1.  We use the
+	continued fraction of w, with Z[w] the ring of integers
+	(see unit_period).  If p/q is the convergent just before
+	the period of w closes then
+			p + q*sqrt(m)             for m = 2, 3 mod 4,
+			(2p - q + q*sqrt(m)) / 2  for m = 1 mod 4,
+	is the fundamental unit.  The work is linear in the
+	period, rather than in the size of the unit.
+	"""
+
+	if result_cache is not None:
+		return result_cache.fund_unit (m, _fund_unit)
+	return _fund_unit (m)
+
+####----- end function -----
+
+
+def _fund_unit (m):
+	""" fund_unit without the cache. """
+
+								# chunk 0 never yields, so the
+								# generator finishes on first next
+	steps = fund_unit_steps (m, 0)
+	try:
+		next (steps)
+	except StopIteration as done:
+		return done.value
+
+####----- end function -----
+
+
+def fund_unit_steps (m, chunk):
+	""" Resumable form of fund_unit.
+
+	A generator doing the work of fund_unit (m), which yields
+	(None) after every chunk partial quotients, so that a
+	caller such as an event loop can pause it.  The unit is the
+	generator's return value.  With chunk = 0 it never yields.
+	"""
+
+	error = unit_check (m)
+	if error is not None:
+		return error
+								# convergents p/q of w
+	p, p_prev = 1, 0
+	q, q_prev = 0, 1
+	cnt = 0
+	for P, Q, a in unit_period (m):
+		p, p_prev = a * p + p_prev, p
+		q, q_prev = a * q + q_prev, q
+		cnt += 1
+		if chunk and cnt % chunk == 0:
+			yield
+	if m % 4 == 1:
+		return Surd (2 * p - q, q, 2, m)
+	return Surd (p, q, 1, m)
+
+####----- end function -----
+
+
+def fund_unit_compact (m):
+	""" Fundamental unit of Q(sqrt(m)) as a product.
+
+	Returns a list of surds (P + sqrt(m)) / Q, the complete
+	quotients over one period (see unit_period), whose product
+	is the fundamental unit.  Each P, Q is below 2*sqrt(m), so
+	this stays small when the unit itself has a huge number of
+	digits.
+	"""
+
+	error = unit_check (m)
+	if error is not None:
+		return error
+	return [Surd (P, 1, Q, m) for P, Q, a in unit_period (m)]
+
+####----- end function -----
+
+
+def regulator (m):
+	""" Regulator of Q(sqrt(m)), the log of the fundamental unit.
+
+	A float, found as the sum of the logs of the factors in
+	fund_unit_compact (m), so the unit is never formed.
+	"""
+
+	error = unit_check (m)
+	if error is not None:
+		return error
+	rt_m = isqrt (m)
+								# sqrt(m) = rt_m + frac, and
+								# log(P + sqrt(m)) is computed as
+								# log(P + rt_m) + log1p(frac/(P + rt_m))
+								# so huge m never becomes a float
+	if m < 2**1000:
+		frac = m**0.5 - rt_m
 	else:
-		b = 1
-		while 1:
-			test_4_square = m*b*b - 4
-			test_a = isqrt (test_4_square)
-			if test_4_square - test_a**2 == 0:
-				return Surd (test_a, b, 2, m)
-			test_4_square = m*b*b + 4
-			test_a = isqrt (test_4_square)
-			if test_4_square - test_a**2 == 0:
-				return Surd (test_a, b, 2, m)
-			b += 1
+		frac = (m - rt_m * rt_m) / (2 * rt_m)
+	reg = 0.0
+	for P, Q, a in unit_period (m):
+		top = P + rt_m
+		reg += math.log (top) + math.log1p (frac / top) - math.log (Q)
+	return reg
 
 ####----- end function -----
 